@@ -6,18 +6,29 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
-from flask import Flask, render_template, jsonify, send_from_directory, request
+from flask import Flask, jsonify, send_from_directory, request
+from flask.json.provider import JSONProvider
 import time
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
+import atexit
 import os
+import re
 from datetime import datetime
 import copy
+import gzip
+import itertools
+from functools import lru_cache
+from dataclasses import dataclass, field, asdict
 from fusion_solar_py.client import FusionSolarClient
 from fusion_solar_py.exceptions import FusionSolarException
 from requests.exceptions import HTTPError
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
+import numpy as np
 
 # Try to import python-dotenv for .env file support
 try:
@@ -29,6 +40,20 @@ except ImportError:
     _LOGGER.warning("python-dotenv not installed. Install with: pip install python-dotenv")
     _LOGGER.warning("Continuing without .env file support, using hardcoded credentials...")
 
+# Try to import orjson for faster JSON decoding of Fusion Solar responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import flask-compress for gzip/brotli compression of JSON responses
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+
 # Configure logging with timestamps and detailed formatting
 # Create logs directory if it doesn't exist
 logs_dir = 'logs'
@@ -57,13 +82,18 @@ file_handler = RotatingFileHandler(
 file_handler.setLevel(logging.INFO)
 file_handler.setFormatter(formatter)
 
-# Configure root logger with both handlers
+# Configure root logger to enqueue records; a listener thread formats and writes them
+# to both handlers, so request/refresh threads never block on stdout or file writes
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
 root_logger = logging.getLogger()
 root_logger.setLevel(logging.INFO)
 # Clear any existing handlers to avoid duplicates
 root_logger.handlers.clear()
-root_logger.addHandler(console_handler)
-root_logger.addHandler(file_handler)
+root_logger.addHandler(QueueHandler(log_queue))
 
 # Get logger for this module
 _LOGGER = logging.getLogger(__name__)
@@ -72,17 +102,18 @@ _LOGGER = logging.getLogger(__name__)
 fusion_solar_logger = logging.getLogger('fusion_solar_py.client')
 fusion_solar_logger.setLevel(logging.INFO)
 
+# CAPTCHA-related keywords, compiled once so each log record is scanned in a single pass
+_CAPTCHA_RE = re.compile(r"captcha|solving|verifycode|verification|prevalidverify", re.IGNORECASE)
+
 # Create a custom handler to intercept CAPTCHA-related messages from fusion_solar_py
 class CaptchaMessageHandler(logging.Handler):
     """Custom handler to detect and log CAPTCHA-related messages from fusion_solar_py"""
     def emit(self, record):
         try:
             msg = record.getMessage()
-            msg_lower = msg.lower()
             
-            # Check for CAPTCHA-related keywords
-            captcha_keywords = ['captcha', 'solving captcha', 'verifycode', 'verification', 'solving', 'prevalidverify']
-            if any(keyword in msg_lower for keyword in captcha_keywords):
+            # Check for CAPTCHA-related keywords (single compiled scan)
+            if _CAPTCHA_RE.search(msg):
                 formatted_msg = self.format(record)
                 _LOGGER.info(f"[CAPTCHA] 🔐 CAPTCHA detected from fusion_solar_py: {msg}")
                 print(f"🔐 [CAPTCHA] {msg}")
@@ -96,19 +127,6 @@ captcha_handler.setLevel(logging.INFO)
 captcha_handler.setFormatter(formatter)
 fusion_solar_logger.addHandler(captcha_handler)
 
-# Also add a filter to catch any CAPTCHA messages
-class CaptchaLogFilter(logging.Filter):
-    """Filter to detect CAPTCHA-related log messages"""
-    def filter(self, record):
-        msg = record.getMessage().lower()
-        if 'captcha' in msg or 'solving' in msg or 'verifycode' in msg:
-            # This will be caught by our handler above
-            return True
-        return True  # Allow all messages
-
-captcha_filter = CaptchaLogFilter()
-fusion_solar_logger.addFilter(captcha_filter)
-
 # Detect if running in production (gunicorn) or development
 # When gunicorn imports the app, __name__ == "app", not "__main__"
 # Also check for environment variable
@@ -120,6 +138,40 @@ app = Flask(__name__)
 # This ensures browser always gets latest version of JS/CSS files
 app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
 
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used for the /api/live-data payloads"""
+    option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if ORJSON_AVAILABLE else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=self.option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.option), mimetype="application/json")
+
+if ORJSON_AVAILABLE:
+    app.json = OrjsonProvider(app)
+
+def _json_bytes(obj):
+    """Serialize a response payload straight to JSON bytes (orjson when available)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=OrjsonProvider.option)
+    return app.json.dumps(obj).encode("utf-8")
+
+# Compress JSON responses (gzip/brotli) to cut bytes over the Raspberry Pi uplink
+if COMPRESS_AVAILABLE:
+    app.config['COMPRESS_MIMETYPES'] = ['application/json']
+    app.config['COMPRESS_LEVEL'] = 6
+    app.config['COMPRESS_MIN_SIZE'] = 500
+    Compress(app)
+else:
+    _LOGGER.warning("flask-compress not installed. Install with: pip install flask-compress")
+    _LOGGER.warning("Continuing without response compression...")
+
 # Set debug mode based on environment
 # In production with gunicorn, debug should be False for security
 if is_production:
@@ -148,6 +200,7 @@ if app.debug:
 # Session pool maintains persistent connections to reduce logins
 # Using lazy approach: only check/keepalive when actually fetching data (not proactively)
 _session_pool = {}  # account_name -> {"client": client, "last_used": timestamp, "lock": threading.Lock()}
+_pool_init_lock = threading.Lock()  # Guards first insert of a USER into _session_pool
 # Note: We don't proactively keepalive. The @logged_in decorator handles session validation.
 # Sessions are checked/refreshed only when we fetch data (every 5 min with cache)
 
@@ -155,9 +208,65 @@ _session_pool = {}  # account_name -> {"client": client, "last_used": timestamp,
 _data_cache = {
     "data": None,
     "timestamp": 0,
-    "lock": threading.Lock()
+    "refreshing": False,  # True while a background refresh thread is running
+    "body": None,  # Serialized /api/live-data response for body_key
+    "body_key": None,  # (data timestamp, chart slot) the body was built for
+    "body_gz": None,  # gzip-encoded copy of "body", built on first request that accepts it
+    "lock": threading.Lock(),  # Guards the fields above (held only briefly)
+    "cold_start_lock": threading.Lock()  # Serializes the blocking first fetch
 }
+# Notified (under "lock") whenever fresh data is swapped in; /api/live-stream waits on it
+_data_cache["updated"] = threading.Condition(_data_cache["lock"])
 CACHE_DURATION = 5 * 60  # 5 minutes in seconds
+# Past this age stale data is no longer served straight away: requests wait (up to
+# CACHE_HARD_WAIT seconds) for the in-flight refresh and only fall back to stale data after that
+CACHE_HARD_MAX_AGE = 3 * CACHE_DURATION
+CACHE_HARD_WAIT = 60
+
+# Seconds between keep-alive comments on an idle /api/live-stream connection
+LIVE_STREAM_KEEPALIVE = 30
+# Each open stream holds a server thread (Procfile: --threads 8), so cap the number of
+# concurrent streams (extra clients get 503 and fall back to polling) and close each
+# stream after LIVE_STREAM_MAX_AGE seconds so the browser reconnects and the slot rotates
+LIVE_STREAM_MAX_CLIENTS = int(os.getenv("LIVE_STREAM_MAX_CLIENTS", "4"))
+LIVE_STREAM_MAX_AGE = 10 * 60
+_live_stream_slots = threading.BoundedSemaphore(LIVE_STREAM_MAX_CLIENTS)
+
+# Background refresher: keep _data_cache warm so /api/live-data never waits on upstream
+# (set BACKGROUND_REFRESH=0 to only refresh on demand)
+BACKGROUND_REFRESH_ENABLED = os.environ.get('BACKGROUND_REFRESH', '1') != '0'
+BACKGROUND_REFRESH_INTERVAL = CACHE_DURATION - 30  # refresh shortly before the cache expires
+
+# Long-lived pool for the per-account fan-out (login, station list, aggregation).
+# Both fan-out levels use persistent threads instead of asyncio: fusion_solar_py drives
+# a blocking requests.Session that holds each account's login cookies.
+ACCOUNT_FETCH_WORKERS = 5
+_account_executor = ThreadPoolExecutor(max_workers=ACCOUNT_FETCH_WORKERS, thread_name_prefix="account-fetch")
+
+# Shared pool for per-plant requests across all accounts, so total concurrency is
+# bounded by the pool size rather than by the number of accounts
+PLANT_FETCH_WORKERS = 32
+_plant_executor = ThreadPoolExecutor(max_workers=PLANT_FETCH_WORKERS, thread_name_prefix="plant-fetch")
+# Max in-flight plant requests per Fusion Solar subdomain (host), across all accounts on it
+PLANT_REQUESTS_PER_SUBDOMAIN = 8
+_subdomain_limiters = {}  # subdomain -> threading.BoundedSemaphore
+_subdomain_limiters_lock = threading.Lock()
+
+# HTTP connection pool size for each account's FusionSolarClient session
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 32
+# Default (connect, read) timeout for every request on a pooled session, so a hung
+# upstream call can't block a worker indefinitely
+HTTP_TIMEOUT = (3.05, 10)
+
+# Per-account cache: last good process_account() result for each account
+# Used as a fallback when one account fails, and to skip accounts refreshed very recently
+_account_cache = {
+    "results": {},  # account_name -> {"timestamp": timestamp, "result": result}
+    "lock": threading.Lock()
+}
+ACCOUNT_CACHE_FALLBACK_MAX_AGE = 2 * CACHE_DURATION  # Max age of a result used as fallback
+ACCOUNT_CACHE_MIN_REFRESH = 60  # Don't re-fetch an account refreshed less than 60s ago
 
 # Disconnected plant threshold: change to red if disconnected for more than X hours
 DISCONNECTED_RED_THRESHOLD_HOURS = 8  # Hours
@@ -168,6 +277,33 @@ DISCONNECTED_RED_THRESHOLD_HOURS = 8  # Hours
 _app_dir = os.path.dirname(os.path.abspath(__file__))
 CAPTCHA_MODEL_PATH = os.path.join(_app_dir, "models", "captcha_huawei.onnx")
 
+def _resolve_captcha_model_path():
+    """
+    Resolve the CAPTCHA model to a readable absolute path, or None if not found.
+    Called once at import so session creation doesn't stat the filesystem every time.
+    """
+    abs_path = os.path.abspath(CAPTCHA_MODEL_PATH)
+    if os.path.exists(abs_path) and os.access(abs_path, os.R_OK):
+        return abs_path
+    # Try alternative paths
+    # NOTE: The first fallback must not repeat CAPTCHA_MODEL_PATH, otherwise it's ineffective.
+    alt_paths = [
+        os.path.join(os.getcwd(), "models", "captcha_huawei.onnx"),
+        os.path.join(os.getcwd(), "src", "models", "captcha_huawei.onnx"),
+        "models/captcha_huawei.onnx",
+        "src/models/captcha_huawei.onnx",
+    ]
+    for alt_path in alt_paths:
+        abs_alt = os.path.abspath(alt_path)
+        if os.path.exists(abs_alt) and os.access(abs_alt, os.R_OK):
+            _LOGGER.info(f"[SESSION] Found CAPTCHA model at alternative path: {abs_alt}")
+            return abs_alt
+    _LOGGER.error(f"[SESSION] CAPTCHA model not found at {CAPTCHA_MODEL_PATH} or alternative paths. Login may fail if CAPTCHA is required.")
+    return None
+
+_captcha_model_abs_path = _resolve_captcha_model_path()
+_CAPTCHA_KWARGS = {"captcha_model_path": _captcha_model_abs_path} if _captcha_model_abs_path else {}
+
 # Default accounts (fallback if .env is not available or not configured)
 # IMPORTANT: For production, use .env file instead of hardcoded credentials
 # This is only a fallback for development/testing
@@ -362,6 +498,18 @@ if not validation_passed:
     # Don't exit - let the app start anyway, but log the issues
     # In production, you might want to exit here: sys.exit(1)
 
+def _decode_json(r):
+    """
+    Decode a Fusion Solar HTTP response body, using orjson when available.
+    An expired session makes the API redirect to the SSO login page (/unisso/...);
+    that is raised as a FusionSolarException instead of failing on the HTML body.
+    """
+    if r.history and "/unisso/" in r.url:
+        raise FusionSolarException(f"Session expired (redirected to login page: {r.url})")
+    if ORJSON_AVAILABLE:
+        return orjson.loads(r.content)
+    return r.json()
+
 def custom_get_station_list(self) -> list:
     """Get all stations with pagination support"""
     all_stations = []
@@ -383,9 +531,9 @@ def custom_get_station_list(self) -> list:
             }
         )
         r.raise_for_status()
-        obj_tree = r.json()
+        obj_tree = _decode_json(r)
         if not obj_tree["success"]:
-            raise Exception("Failed to retrieve station list")
+            raise FusionSolarException("Failed to retrieve station list")
         
         stations = obj_tree["data"]["list"]
         if not stations:  # No more stations
@@ -411,7 +559,7 @@ def custom_get_station_list(self) -> list:
             
         cur_page += 1
     
-    print(f"Fetched {len(all_stations)} stations (across {cur_page} page(s))")
+    _LOGGER.debug(f"Fetched {len(all_stations)} stations (across {cur_page} page(s))")
     return all_stations
 
 # Monkey-patch the class
@@ -486,9 +634,16 @@ list_of_plants = [
     ("MAP UPAC 1", "0"),    
 ]
 
+# Plant name -> maintenance code ("1" = in maintenance), built once from list_of_plants
+_PLANT_WORKING_MAP = dict(list_of_plants)
+
 @app.route("/")
 def index():
-    return render_template("index.html")  # This looks in the 'templates/' folder
+    # index.html has no template variables, so serve it as a static file instead of
+    # re-rendering through Jinja on every page load. It is always revalidated (no-cache +
+    # ETag/Last-Modified, so usually a cheap 304): the unversioned /static JS and CSS are
+    # not cached either, and an old shell must not be paired with a newer script.js
+    return send_from_directory(app.template_folder, "index.html", max_age=0)
     
 class PowerStatus:
     """Class representing the basic power status"""
@@ -548,17 +703,32 @@ class PowerStatus:
                 f"energy_today_kwh={self.energy_today_kwh}, "
                 f"energy_kwh={self.energy_kwh})")
 
+@dataclass(slots=True)
+class PlantStatus:
+    """Status row for a single plant, as shown in the dashboard table"""
+    name: str
+    pinstalled: float
+    production: float
+    consumption: float
+    grid: float
+    surplus: float
+    status_icon: str
+    last_data_time: str = None
+    active_alarms: list = field(default_factory=list)
+    alarm_count: int = 0
+
 def get_current_plant_data(self, plant_id: str) -> dict:
         """Retrieve the current power status for a specific plant.
         :return: A dict object containing the whole data
         """
 
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/station-real-kpi"
+        now_ms = round(time.time() * 1000)
         params = {
             "stationDn": plant_id,
-            "clientTime": round(time.time() * 1000),
+            "clientTime": now_ms,
             "timeZone": 1,
-            "_": round(time.time() * 1000),
+            "_": now_ms,
         }
 
         r = self._session.get(url=url, params=params)
@@ -566,7 +736,7 @@ def get_current_plant_data(self, plant_id: str) -> dict:
 
         # errors in decoding the object generally mean that the login expired
         # this is handeled by @logged_in
-        power_obj = r.json()
+        power_obj = _decode_json(r)
 
         if "data" not in power_obj:
             raise FusionSolarException("Failed to retrieve plant data.")
@@ -575,7 +745,7 @@ def get_current_plant_data(self, plant_id: str) -> dict:
 
 
 def get_plant_stats_yearly(
-        self, plant_id: str, query_time: int = None
+        self, plant_id: str, query_time: int = None, now_ms: int = None
     ) -> dict:
         """Retrieves the complete plant usage statistics for the current day.
         :param plant_id: The plant's id
@@ -584,11 +754,16 @@ def get_plant_stats_yearly(
                            be fetched for. If not set, retrieves the data for the
                            current day.
         :type query_time: int
+        :param now_ms: If set, the current time in milliseconds (shared across a
+                       refresh cycle). If not set, it is computed on each call.
+        :type now_ms: int
         :return: _description_
         """
         # set the query time to today
         if not query_time:
             query_time = self._get_day_start_sec()
+        if not now_ms:
+            now_ms = round(time.time() * 1000)
             
         r = self._session.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
@@ -599,11 +774,11 @@ def get_plant_stats_yearly(
                 # dateTime=2024-03-07 00:00:00
                 "timeZone": 2,  # 1 in no daylight
                 "timeZoneStr": "Europe/Vienna",
-                "_": round(time.time() * 1000),
+                "_": now_ms,
             },
         )
         r.raise_for_status()
-        plant_data = r.json()
+        plant_data = _decode_json(r)
 
         if not plant_data["success"] or "data" not in plant_data:
             raise FusionSolarException(
@@ -614,7 +789,7 @@ def get_plant_stats_yearly(
         return plant_data["data"]
         
 def get_plant_stats_monthly(
-        self, plant_id: str, query_time: int = None
+        self, plant_id: str, query_time: int = None, now_ms: int = None
     ) -> dict:
         """Retrieves the complete plant usage statistics for the current day.
         :param plant_id: The plant's id
@@ -623,11 +798,16 @@ def get_plant_stats_monthly(
                            be fetched for. If not set, retrieves the data for the
                            current day.
         :type query_time: int
+        :param now_ms: If set, the current time in milliseconds (shared across a
+                       refresh cycle). If not set, it is computed on each call.
+        :type now_ms: int
         :return: _description_
         """
         # set the query time to today
         if not query_time:
             query_time = self._get_day_start_sec()
+        if not now_ms:
+            now_ms = round(time.time() * 1000)
             
         r = self._session.get(
             url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
@@ -638,11 +818,11 @@ def get_plant_stats_monthly(
                 # dateTime=2024-03-07 00:00:00
                 "timeZone": 2,  # 1 in no daylight
                 "timeZoneStr": "Europe/Vienna",
-                "_": round(time.time() * 1000),
+                "_": now_ms,
             },
         )
         r.raise_for_status()
-        plant_data = r.json()
+        plant_data = _decode_json(r)
 
         if not plant_data["success"] or "data" not in plant_data:
             raise FusionSolarException(
@@ -660,10 +840,11 @@ def get_power_status(self) -> PowerStatus:
         """
 
         url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/station/total-real-kpi"
+        now_ms = round(time.time() * 1000)
         params = {
-            "queryTime": round(time.time() * 1000),
+            "queryTime": now_ms,
             "timeZone": 1,
-            "_": round(time.time() * 1000),
+            "_": now_ms,
         }
 
         r = self._session.get(url=url, params=params)
@@ -671,7 +852,7 @@ def get_power_status(self) -> PowerStatus:
 
         # errors in decoding the object generally mean that the login expired
         # this is handeled by @logged_in
-        power_obj = r.json()
+        power_obj = _decode_json(r)
 
         power_status = PowerStatus(
             current_power_kw=float( power_obj["data"]["currentPower"] ),
@@ -681,8 +862,21 @@ def get_power_status(self) -> PowerStatus:
 
         return power_status
 
+@lru_cache(maxsize=1)
+def _day_start_for(utc_date: str) -> int:
+    """Start of `utc_date` ("YYYY-MM-DD") as the library computes it (local mktime, in ms)"""
+    struct_time = time.strptime(f"{utc_date} 00:00:00", "%Y-%m-%d %H:%M:%S")
+    return round(time.mktime(struct_time) * 1000)
+
+def _get_day_start_sec(self) -> int:
+    """Return the start of the current day, as the library does, but parsed once per day
+    :return: The start of the day ("00:00:00") in milliseconds
+    :rtype: int
+    """
+    return _day_start_for(time.strftime("%Y-%m-%d", time.gmtime()))
+
 def get_plant_stats(
-    self, plant_id: str, query_time: int = None
+    self, plant_id: str, query_time: int = None, now_ms: int = None
 ) -> dict:
     """Retrieves the complete plant usage statistics for the current day.
     :param plant_id: The plant's id
@@ -691,11 +885,16 @@ def get_plant_stats(
                        be fetched for. If not set, retrieves the data for the
                        current day.
     :type query_time: int
+    :param now_ms: If set, the current time in milliseconds (shared across a
+                   refresh cycle). If not set, it is computed on each call.
+    :type now_ms: int
     :return: _description_
     """
     # set the query time to today
     if not query_time:
         query_time = self._get_day_start_sec()
+    if not now_ms:
+        now_ms = round(time.time() * 1000)
 
     r = self._session.get(
         url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
@@ -706,11 +905,11 @@ def get_plant_stats(
             # dateTime=2024-03-07 00:00:00
             "timeZone": 2,  # 1 in no daylight
             "timeZoneStr": "Europe/Vienna",
-            "_": round(time.time() * 1000),
+            "_": now_ms,
         },
     )
     r.raise_for_status()
-    plant_data = r.json()
+    plant_data = _decode_json(r)
 
     if not plant_data["success"] or "data" not in plant_data:
         raise FusionSolarException(
@@ -769,7 +968,7 @@ def get_inverter_ids(self, plant_id: str) -> list:
         
         # If no inverters found via plant flow, try alternative method
         if not inverter_ids:
-            _LOGGER.info(f"No inverters found via plant flow for {plant_id}, trying alternative method")
+            _LOGGER.debug(f"No inverters found via plant flow for {plant_id}, trying alternative method")
             # Method 2: Try using get_device_ids and filter (less precise but may work)
             try:
                 if not hasattr(self, 'get_device_ids'):
@@ -790,19 +989,21 @@ def get_inverter_ids(self, plant_id: str) -> list:
                         else:
                             _LOGGER.warning(f"Inverter device found but deviceDn is missing or None: {device}")
             except Exception as e2:
-                _LOGGER.warning(f"Alternative method also failed for plant {plant_id}: {e2}", exc_info=True)
+                _LOGGER.warning("Alternative method also failed for plant %s: %s", plant_id, e2)
+                _LOGGER.debug("Traceback for alternative method failure", exc_info=True)
         
         if inverter_ids:
-            _LOGGER.info(f"Found {len(inverter_ids)} inverter(s) for plant {plant_id}: {inverter_ids}")
+            _LOGGER.debug(f"Found {len(inverter_ids)} inverter(s) for plant {plant_id}: {inverter_ids}")
         else:
-            _LOGGER.info(f"No inverters found for plant {plant_id}")
+            _LOGGER.debug(f"No inverters found for plant {plant_id}")
         
         return inverter_ids
     except AttributeError as e:
         _LOGGER.error(f"Method not available when getting inverter IDs for plant {plant_id}: {e}", exc_info=True)
         return []
     except Exception as e:
-        _LOGGER.warning(f"Failed to get inverter IDs for plant {plant_id}: {e}", exc_info=True)
+        _LOGGER.warning("Failed to get inverter IDs for plant %s: %s", plant_id, e)
+        _LOGGER.debug("Traceback for inverter IDs failure", exc_info=True)
         return []
 
 def get_plant_alarm_data(self, plant_id: str) -> dict:
@@ -823,7 +1024,7 @@ def get_plant_alarm_data(self, plant_id: str) -> dict:
     _LOGGER.debug(f"get_plant_alarm_data: Calling API with plant_id={plant_id}, request_data={request_data}")
     r = self._session.post(url=url, json=request_data)
     r.raise_for_status()
-    response = r.json()
+    response = _decode_json(r)
     _LOGGER.debug(f"get_plant_alarm_data: API returned response type={type(response)}, keys={list(response.keys()) if isinstance(response, dict) else 'N/A'}")
     if isinstance(response, dict) and "data" in response:
         _LOGGER.debug(f"get_plant_alarm_data: response['data'] type={type(response['data'])}, keys={list(response['data'].keys()) if isinstance(response['data'], dict) else 'N/A'}")
@@ -835,12 +1036,27 @@ FusionSolarClient.get_plant_stats_yearly = get_plant_stats_yearly
 FusionSolarClient.get_plant_stats_monthly = get_plant_stats_monthly
 FusionSolarClient.get_power_status = get_power_status
 FusionSolarClient.get_plant_stats = get_plant_stats
+FusionSolarClient._get_day_start_sec = _get_day_start_sec
 FusionSolarClient.get_inverter_ids = get_inverter_ids
 FusionSolarClient.get_plant_alarm_data = get_plant_alarm_data
 
 # Note: get_alarm_data() already exists in fusion_solar_py library, no monkey-patch needed
 # The method is available at: FusionSolarClient.get_alarm_data(device_dn)
 
+# Plant status decision table: (plantStatus, production != 0, consumption != 0) -> (status_icon, error_state)
+# error_state indexes error_messages below (0 = working normally)
+_STATUS_TABLE = {
+    ('connected', True, True): ("🟢", 0),
+    ('disconnected', True, True): ("🟡", 1),
+    ('disconnected', True, False): ("🟡", 1),
+    ('disconnected', False, True): ("🟡", 1),
+    ('disconnected', False, False): ("🟡", 1),
+    ('connected', True, False): ("🟡", 2),
+    ('connected', False, True): ("🟡", 3),
+    ('connected', False, False): ("🟡", 3),
+}
+_STATUS_DEFAULT = ("🟡", 4)
+
 error_messages = {
             1: "Instalação Desligada",
             2: "Sem Consumo",
@@ -848,6 +1064,85 @@ error_messages = {
             4: "Erro de Comunicação"
         }
 
+# Alarm severity (code or name) -> emoji shown next to the alarm
+_ALARM_LEVEL_EMOJI = {
+    "1": "🔴",  # Critical
+    "2": "🟠",  # Major
+    "3": "🟡",  # Minor
+    "4": "⚪",  # Warning
+    "critical": "🔴",
+    "major": "🟠",
+    "minor": "🟡",
+    "warning": "⚪"
+}
+
+# Alert sort order by leading emoji (every alert is "<emoji> <text>"); anything else sorts last
+_ALERT_PRIORITY = {
+    "🔴": 0,  # Highest priority - Critical
+    "🟠": 1,  # Major alarms
+    "⏳": 2,  # In maintenance
+    "🟡": 3,  # Minor alarms
+    "⚪": 4,  # Warning alarms
+    "⚠️": 5,
+}
+
+def _alert_priority(alert):
+    """Sort key for an alert: one dict lookup on its leading emoji"""
+    return _ALERT_PRIORITY.get(alert.partition(" ")[0], 6)
+
+# Alert text per error_state, built once ("{icon} {name} - <message>")
+_ALERT_TEMPLATES = {state: "{icon} {name} - " + msg for state, msg in error_messages.items()}
+_DEFAULT_ALERT_TEMPLATE = "{icon} {name} - Erro desconhecido"
+
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that applies HTTP_TIMEOUT to requests sent without an explicit timeout"""
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = HTTP_TIMEOUT
+        return super().send(request, **kwargs)
+
+def _configure_http_session(session):
+    """
+    Mount a pooled HTTPAdapter on a FusionSolarClient's requests.Session.
+    Each account keeps its own session (login cookies are per account), but the larger
+    pool lets concurrent plant requests reuse keep-alive connections instead of
+    opening a new TCP+TLS connection each time.
+    """
+    adapter = _TimeoutHTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        # Fusion Solar's POST endpoints used here are read-only queries, so they are safe to retry
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+
+def _is_session_error(error):
+    """
+    True if an API error means the account's session expired or was rejected.
+    A non-JSON body (ValueError, e.g. the HTML login page) counts as an expired session too.
+    """
+    if isinstance(error, (FusionSolarException, ValueError)):
+        return True
+    if isinstance(error, HTTPError) and error.response is not None:
+        return error.response.status_code in (401, 403)
+    return False
+
+def _discard_client(user, client):
+    """Drop a pooled client whose session is no longer usable, so the next call logs in again"""
+    entry = _session_pool.get(user)
+    if entry is None:
+        return
+    with entry["lock"]:
+        if entry["client"] is client:
+            entry["client"] = None
+            _LOGGER.warning(f"[SESSION] Discarded session for {user}, will log in again on next refresh")
 
 def get_or_create_client(account):
     """
@@ -860,12 +1155,15 @@ def get_or_create_client(account):
     current_time = time.time()
     
     # Initialize session pool entry if it doesn't exist
+    # Re-check under the pool lock so concurrent threads for the same USER share one entry/lock
     if USER not in _session_pool:
-        _session_pool[USER] = {
-            "client": None,
-            "last_used": 0,
-            "lock": threading.Lock()
-        }
+        with _pool_init_lock:
+            if USER not in _session_pool:
+                _session_pool[USER] = {
+                    "client": None,
+                    "last_used": 0,
+                    "lock": threading.Lock()
+                }
     
     with _session_pool[USER]["lock"]:
         client = _session_pool[USER]["client"]
@@ -883,58 +1181,10 @@ def get_or_create_client(account):
                 _LOGGER.debug(f"[SESSION] USER type: {type(USER)}, SUBDOMAIN type: {type(SUBDOMAIN)}, PASSWORD type: {type(PASSWORD)}")
                 _LOGGER.debug(f"[SESSION] USER repr: {repr(USER)}, SUBDOMAIN repr: {repr(SUBDOMAIN)}")
                 
-                # Initialize client with captcha support if model path is provided
-                client_kwargs = {"huawei_subdomain": SUBDOMAIN}
-                _LOGGER.debug(f"[SESSION] Initial client_kwargs: {client_kwargs}")
-                
-                if CAPTCHA_MODEL_PATH:
-                    _LOGGER.debug(f"[SESSION] CAPTCHA_MODEL_PATH: '{CAPTCHA_MODEL_PATH}'")
-                    _LOGGER.debug(f"[SESSION] CAPTCHA_MODEL_PATH exists: {os.path.exists(CAPTCHA_MODEL_PATH) if CAPTCHA_MODEL_PATH else False}")
-                    _LOGGER.debug(f"[SESSION] CAPTCHA_MODEL_PATH absolute: {os.path.abspath(CAPTCHA_MODEL_PATH) if CAPTCHA_MODEL_PATH else 'N/A'}")
-                    
-                    if os.path.exists(CAPTCHA_MODEL_PATH):
-                        try:
-                            # Use absolute path to ensure it works in production
-                            abs_path = os.path.abspath(CAPTCHA_MODEL_PATH)
-                            _LOGGER.debug(f"[SESSION] CAPTCHA model absolute path: '{abs_path}'")
-                            # Verify file is readable
-                            if os.access(abs_path, os.R_OK):
-                                client_kwargs["captcha_model_path"] = abs_path
-                                _LOGGER.info(f"[SESSION] CAPTCHA support enabled - using model: {abs_path}")
-                                print(f"Using CAPTCHA model: {abs_path}")
-                            else:
-                                _LOGGER.warning(f"[SESSION] CAPTCHA model file exists but is not readable: {abs_path}")
-                                print(f"⚠️  Warning: CAPTCHA model file is not readable at {abs_path}")
-                        except Exception as path_error:
-                            _LOGGER.error(f"[SESSION] Error processing CAPTCHA model path '{CAPTCHA_MODEL_PATH}': {path_error}", exc_info=True)
-                            print(f"⚠️  Error with CAPTCHA model path: {path_error}")
-                    else:
-                        _LOGGER.warning(f"[SESSION] CAPTCHA model path specified but file not found: {CAPTCHA_MODEL_PATH}")
-                        _LOGGER.warning(f"[SESSION] Current working directory: {os.getcwd()}")
-                        _LOGGER.warning(f"[SESSION] App directory: {_app_dir}")
-                        _LOGGER.warning(f"[SESSION] Attempting to find model in common locations...")
-                        # Try alternative paths
-                        # NOTE: The first fallback must not repeat CAPTCHA_MODEL_PATH, otherwise it's ineffective.
-                        alt_paths = [
-                            os.path.join(os.getcwd(), "models", "captcha_huawei.onnx"),
-                            os.path.join(os.getcwd(), "src", "models", "captcha_huawei.onnx"),
-                            "models/captcha_huawei.onnx",
-                            "src/models/captcha_huawei.onnx",
-                        ]
-                        found = False
-                        for alt_path in alt_paths:
-                            abs_alt = os.path.abspath(alt_path)
-                            if os.path.exists(abs_alt) and os.access(abs_alt, os.R_OK):
-                                _LOGGER.info(f"[SESSION] Found CAPTCHA model at alternative path: {abs_alt}")
-                                client_kwargs["captcha_model_path"] = abs_alt
-                                print(f"Using CAPTCHA model (found at alternative path): {abs_alt}")
-                                found = True
-                                break
-                        if not found:
-                            _LOGGER.error(f"[SESSION] CAPTCHA model not found in any location. Login may fail if CAPTCHA is required.")
-                            print(f"⚠️  Warning: CAPTCHA model not found at {CAPTCHA_MODEL_PATH} or alternative paths")
-                else:
-                    _LOGGER.debug(f"[SESSION] No CAPTCHA_MODEL_PATH configured")
+                # Initialize client with captcha support (model path resolved once at import)
+                client_kwargs = {"huawei_subdomain": SUBDOMAIN, **_CAPTCHA_KWARGS}
+                if not _CAPTCHA_KWARGS:
+                    _LOGGER.debug(f"[SESSION] No readable CAPTCHA model available, logging in without CAPTCHA support")
                 
                 _LOGGER.debug(f"[SESSION] Final client_kwargs: {client_kwargs}")
                 _LOGGER.info(f"[SESSION] Attempting login for account: {USER}...")
@@ -980,6 +1230,8 @@ def get_or_create_client(account):
                     _LOGGER.info(f"[CAPTCHA] ⚠️ Login took {login_duration:.2f}s for {USER} (may indicate CAPTCHA was solved)")
                     print(f"⚠️ Login took {login_duration:.2f}s (possibly CAPTCHA solving)")
                 
+                # Reuse keep-alive sockets across plants/threads for this account's session
+                _configure_http_session(client._session)
                 _session_pool[USER]["client"] = client
                 _session_pool[USER]["last_used"] = current_time
                 _session_pool[USER]["created_at"] = current_time
@@ -1028,8 +1280,7 @@ def get_or_create_client(account):
             created_at = _session_pool[USER].get("created_at", last_used)
             total_session_age = current_time - created_at
             
-            _LOGGER.info(f"[SESSION] Reusing existing session for {USER} (last used: {session_age:.1f}s ago, total age: {total_session_age:.1f}s)")
-            print(f"♻️  Reusing session for {USER} (last used {session_age:.0f}s ago)")
+            _LOGGER.debug(f"[SESSION] Reusing existing session for {USER} (last used: {session_age:.1f}s ago, total age: {total_session_age:.1f}s)")
         
         # Update last used timestamp
         _session_pool[USER]["last_used"] = current_time
@@ -1045,14 +1296,13 @@ def get_or_create_client(account):
             # This is safe because @logged_in will re-auth if keep_alive() fails
             client.keep_alive()
             keepalive_duration = time.time() - keepalive_start_time
-            _LOGGER.info(f"[KEEPALIVE] ✓ Keep-alive successful for {USER} (took {keepalive_duration:.3f}s)")
+            _LOGGER.debug(f"[KEEPALIVE] ✓ Keep-alive successful for {USER} (took {keepalive_duration:.3f}s)")
         except FusionSolarException as keepalive_error:
             keepalive_duration = time.time() - keepalive_start_time
             error_msg = str(keepalive_error)
             # If keep_alive fails, @logged_in decorator will handle it on next API call
             _LOGGER.warning(f"[KEEPALIVE] ✗ Keep-alive FAILED for {USER} (took {keepalive_duration:.3f}s): {error_msg}")
             _LOGGER.warning(f"[KEEPALIVE] Session for {USER} may have expired. @logged_in decorator will re-authenticate on next API call.")
-            print(f"⚠️  Keep-alive failed for {USER} (session may have expired, will renew on next request)")
             # No need to handle here - let the decorator do its job
             pass
         except Exception as keepalive_error:
@@ -1061,13 +1311,126 @@ def get_or_create_client(account):
             error_msg = str(keepalive_error)
             _LOGGER.warning(f"[KEEPALIVE] ✗ Keep-alive exception for {USER} ({error_type}, took {keepalive_duration:.3f}s): {error_msg}")
             _LOGGER.warning(f"[KEEPALIVE] Session for {USER} will be renewed by @logged_in decorator on next API call.")
-            print(f"⚠️  Keep-alive error for {USER}: {error_type}: {error_msg}")
             # No need to handle here - let the decorator do its job
             pass
         
         return client
 
-def process_account(account):
+def _series_to_array(values):
+    """
+    Convert a plant_stats series ('--' means no data) to a float32 array.
+    Other non-numeric samples (e.g. None) raise, like float(v), so the plant is reported as an error.
+    """
+    return np.fromiter((0.0 if v == '--' else float(v) for v in values), dtype=np.float32, count=len(values))
+
+def _sum_series(series):
+    """
+    Sum per-account chart arrays in one reduction, or None if there are none.
+    Series of different lengths are truncated to the shortest one (same as zip()).
+    """
+    if not series:
+        return None
+    n = min(len(values) for values in series)
+    return np.sum([values[:n] for values in series], axis=0, dtype=np.float32)
+
+def _fill_series_row(row, values):
+    """Copy a plant_stats series into a preallocated day row; missing slots stay at 0"""
+    arr = _series_to_array(values)[:len(row)]
+    row[:len(arr)] = arr
+
+# get_last_plant_data() keys for production, consumption and grid power
+_LATEST_VALUE_KEYS = ('productPower', 'usePower', 'meterActivePower')
+
+def _latest_value(plant_data, key):
+    """Return (value as float, time or None) for one get_last_plant_data() entry"""
+    entry = plant_data.get(key, {})
+    if isinstance(entry, dict):
+        return float(entry.get('value') or 0), entry.get('time')
+    return float(entry or 0), None
+
+def _chart_list(summed):
+    """
+    Round a chart accumulator to 2 decimals and convert it to a JSON-friendly list.
+    This is the only rounding step for chart series: sums stay unrounded until here.
+    """
+    # float64 so tolist() yields the short decimal (1.2, not 1.2000000476837158)
+    values = summed.astype(np.float64)
+    np.round(values, 2, out=values)
+    return values.tolist()
+
+def _subdomain_limiter(subdomain):
+    """Semaphore bounding concurrent plant requests to one Fusion Solar subdomain"""
+    with _subdomain_limiters_lock:
+        limiter = _subdomain_limiters.get(subdomain)
+        if limiter is None:
+            limiter = _subdomain_limiters[subdomain] = threading.BoundedSemaphore(PLANT_REQUESTS_PER_SUBDOMAIN)
+        return limiter
+
+def _fetch_plant_data(client, plant_id, plant_name, query_time, now_ms, limiter):
+    """
+    Fetch today's stats and latest values for one plant, retrying once after 10 seconds.
+    `limiter` is held only around each request, not during the retry wait.
+    Returns (plant_stats, plant_data, None) on success or (None, None, error_msg) on failure.
+    """
+    try:
+        with limiter:
+            plant_stats = client.get_plant_stats(plant_id, query_time, now_ms=now_ms)
+        plant_data = client.get_last_plant_data(plant_stats)
+        _LOGGER.debug(f"Successfully retrieved data for plant: {plant_name}")
+    except Exception as e:
+        error_kind = "FusionSolar API error" if isinstance(e, FusionSolarException) else type(e).__name__
+        _LOGGER.warning(f"Error fetching data for plant {plant_name} (ID: {plant_id}) on first attempt: {error_kind} - {e}")
+        # Retry after 10 seconds
+        time.sleep(10)
+        try:
+            _LOGGER.info(f"Retrying get_plant_stats/get_last_plant_data for {plant_name} after error...")
+            with limiter:
+                plant_stats = client.get_plant_stats(plant_id, query_time, now_ms=now_ms)
+            plant_data = client.get_last_plant_data(plant_stats)
+            _LOGGER.debug(f"Successfully retrieved data for plant on retry: {plant_name}")
+        except Exception as e_retry:
+            retry_msg = str(e_retry)
+            retry_kind = "FusionSolar API error" if isinstance(e_retry, FusionSolarException) else type(e_retry).__name__
+            _LOGGER.error("Error fetching data for plant %s (ID: %s) after retry: %s - %s", plant_name, plant_id, retry_kind, retry_msg)
+            _LOGGER.debug("Traceback for plant data fetch failure", exc_info=True)
+            return None, None, retry_msg
+    return plant_stats, plant_data, None
+
+def _store_account_result(user, result):
+    """Remember the last successful process_account() result for an account"""
+    with _account_cache["lock"]:
+        _account_cache["results"][user] = {
+            "timestamp": time.time(),
+            "result": copy.deepcopy(result)
+        }
+
+def _get_cached_account_result(user, max_age):
+    """Return a copy of the cached result for an account if younger than max_age seconds, else None"""
+    with _account_cache["lock"]:
+        entry = _account_cache["results"].get(user)
+        if entry is None or time.time() - entry["timestamp"] >= max_age:
+            return None
+        return copy.deepcopy(entry["result"])
+
+def _account_fallback(user, result):
+    """
+    On a failed refresh, fall back to the last good result for the account (if recent enough)
+    instead of the all-zero stub, keeping the error visible as an alert.
+    """
+    cached = _get_cached_account_result(user, ACCOUNT_CACHE_FALLBACK_MAX_AGE)
+    if cached is None:
+        return result
+    _LOGGER.warning(f"Refresh failed for account {user}, using last good cached result")
+    cached["alerts"].extend(result["alerts"])
+    return cached
+
+def process_account(account, now=None):
+    """
+    Fetch and aggregate all plants of one account.
+    `now` is the refresh cycle's clock reading (datetime), shared by all accounts.
+    """
+    if now is None:
+        now = datetime.now()
     USER, PASSWORD, SUBDOMAIN = account
     result = {
         "production": 0.0,
@@ -1091,33 +1454,43 @@ def process_account(account):
             error_msg = str(login_error)
             error_type = type(login_error).__name__
             _LOGGER.error(f"Login failed for account {USER}: {error_type} - {error_msg}", exc_info=True)
-            print(f"❌ Erro no login da conta {USER}: {error_type}: {error_msg}")
             result["alerts"].append(f"🔴 Conta {USER} - Erro no login: {error_msg[:100]}")
-            return result
+            return _account_fallback(USER, result)
+
+        # Timestamps shared by every plant request in this refresh cycle
+        query_time = client._get_day_start_sec()
+        now_ms = round(now.timestamp() * 1000)
 
         _LOGGER.info(f"Fetching station list for account: {USER}")
         try:
             plants = client.get_station_list()
-            _LOGGER.info(f"Successfully retrieved station list for {USER}")
+            _LOGGER.debug(f"Successfully retrieved station list for {USER}")
         except Exception as station_error:
             error_msg = str(station_error)
             error_type = type(station_error).__name__
             _LOGGER.error(f"Failed to fetch station list for {USER}: {error_type} - {error_msg}", exc_info=True)
-            print(f"❌ Erro ao buscar lista de estações para {USER}: {error_type}: {error_msg}")
+            if _is_session_error(station_error):
+                # Session is no longer usable: log in again on the next refresh
+                _discard_client(USER, client)
             result["alerts"].append(f"🔴 Conta {USER} - Erro ao buscar estações: {error_msg[:100]}")
-            return result
+            return _account_fallback(USER, result)
         if not plants:
-            try:
-                print(f"⚠️ Nenhuma instalação encontrada para {USER}")
-            except (UnicodeEncodeError, UnicodeError):
-                print(f"Nenhuma instalação encontrada para {USER}")
+            _LOGGER.warning(f"No stations found for account {USER}")
             # Add warning to alerts
             result["alerts"].append(f"⚠️ Conta {USER} - Nenhuma instalação encontrada")
             # Don't log out - keep session alive for reuse
             return result
 
         number_plants = len(plants)
-        print(f"Found {number_plants} stations for account {USER}")
+        _LOGGER.info(f"Found {number_plants} stations for account {USER}")
+        # One status row per plant, written by index as each plant is processed
+        statuses = [None] * number_plants
+        result["statuses"] = statuses
+        # Chart series, one row per plant over the day's timeslots (plants that fail stay at 0)
+        prod_mat = np.zeros((number_plants, len(_X_AXIS)), dtype=np.float32)
+        cons_mat = np.zeros_like(prod_mat)
+        self_mat = np.zeros_like(prod_mat)
+        has_chart_data = False
         # Build installed capacity map - support both field names (installedCapacity and onlyInverterPower)
         installed_capacity_map = {}
         for p in plants:
@@ -1133,6 +1506,17 @@ def process_account(account):
             except (ValueError, TypeError):
                 installed_capacity_map[plant_name] = 0.0
 
+        # Fetch every plant's stats concurrently on the shared plant pool (I/O bound);
+        # the status/alarm processing below stays sequential and consumes the results in order.
+        # The web energy-balance endpoint only takes one stationDn (there is no multi-station
+        # variant behind this login), and get_last_plant_data() reads the latest values from
+        # the same response, so this is already a single request per plant.
+        limiter = _subdomain_limiter(SUBDOMAIN)
+        fetched = list(_plant_executor.map(
+            lambda p: _fetch_plant_data(client, p['dn'], p['name'], query_time, now_ms, limiter),
+            plants
+        ))
+
         for i, plant in enumerate(plants, start=1):
             plant_id = plant['dn']
             plant_name = plant["name"]
@@ -1142,89 +1526,33 @@ def process_account(account):
             disconnected_alert_msg = None
 
             _LOGGER.debug(f"Processing plant {i}/{number_plants}: {plant_name} (ID: {plant_id})")
-            print(f"  → Analyzing installation {i}/{number_plants}: {plant_name}")
-            try:
-                plant_stats = client.get_plant_stats(plant_id)
-                plant_data = client.get_last_plant_data(plant_stats)
-                _LOGGER.debug(f"Successfully retrieved data for plant: {plant_name}")
-            except FusionSolarException as e:
-                error_msg = str(e)
-                _LOGGER.warning(f"FusionSolar API error fetching data for {plant_name} (ID: {plant_id}) on first attempt: {error_msg}")
-                print(f"    ⚠️  API error for {plant_name} (1ª tentativa): {error_msg}")
-                # Retry after 10 seconds
-                time.sleep(10)
-                try:
-                    _LOGGER.info(f"Retrying get_plant_stats/get_last_plant_data for {plant_name} after error...")
-                    plant_stats = client.get_plant_stats(plant_id)
-                    plant_data = client.get_last_plant_data(plant_stats)
-                    _LOGGER.debug(f"Successfully retrieved data for plant on retry: {plant_name}")
-                except FusionSolarException as e_retry:
-                    retry_msg = str(e_retry)
-                    _LOGGER.error(f"FusionSolar API error fetching data for {plant_name} (ID: {plant_id}) after retry: {retry_msg}")
-                    print(f"    ❌ API error for {plant_name} após retry: {retry_msg}")
-                    # Continue with next plant even if this one fails
-                    result["statuses"].append({
-                        "name": plant_name,
-                        "pinstalled": installed_capacity,
-                        "production": 0.0,
-                        "consumption": 0.0,
-                        "grid": 0.0,
-                        "surplus": 0.0,
-                        "status_icon": "🔴"
-                    })
-                    # Add detailed error message (truncated if too long)
-                    error_display = retry_msg[:80] + "..." if len(retry_msg) > 80 else retry_msg
-                    result["alerts"].append(f"🔴 {plant_name} - Erro ao buscar dados: {error_display}")
-                    continue
-            except Exception as e:
-                error_msg = str(e)
-                error_type = type(e).__name__
-                _LOGGER.warning(f"Error fetching data for plant {plant_name} (ID: {plant_id}) on first attempt: {error_type} - {error_msg}")
-                print(f"    ⚠️  Erro ao buscar dados da instalação {plant_name} (1ª tentativa): {error_type}: {error_msg}")
-                # Retry after 10 seconds
-                time.sleep(10)
-                try:
-                    _LOGGER.info(f"Retrying get_plant_stats/get_last_plant_data for {plant_name} after generic error...")
-                    plant_stats = client.get_plant_stats(plant_id)
-                    plant_data = client.get_last_plant_data(plant_stats)
-                    _LOGGER.debug(f"Successfully retrieved data for plant on retry: {plant_name}")
-                except Exception as e_retry:
-                    retry_msg = str(e_retry)
-                    retry_type = type(e_retry).__name__
-                    _LOGGER.error(f"Error fetching data for plant {plant_name} (ID: {plant_id}) after retry: {retry_type} - {retry_msg}", exc_info=True)
-                    print(f"    ❌ Erro ao buscar dados da instalação {plant_name} após retry: {retry_type}: {retry_msg}")
-                    # Continue with next plant even if this one fails
-                    result["statuses"].append({
-                        "name": plant_name,
-                        "pinstalled": installed_capacity,
-                        "production": 0.0,
-                        "consumption": 0.0,
-                        "grid": 0.0,
-                        "surplus": 0.0,
-                        "status_icon": "🔴"
-                    })
-                    # Add detailed error message (truncated if too long)
-                    error_display = retry_msg[:80] + "..." if len(retry_msg) > 80 else retry_msg
-                    result["alerts"].append(f"🔴 {plant_name} - Erro ao buscar dados: {error_display}")
-                    continue
+            plant_stats, plant_data, fetch_error = fetched[i - 1]
+            if fetch_error is not None:
+                # Continue with next plant even if this one fails
+                statuses[i - 1] = PlantStatus(
+                    name=plant_name,
+                    pinstalled=installed_capacity,
+                    production=0.0,
+                    consumption=0.0,
+                    grid=0.0,
+                    surplus=0.0,
+                    status_icon="🔴"
+                )
+                # Add detailed error message (truncated if too long)
+                error_display = fetch_error[:80] + "..." if len(fetch_error) > 80 else fetch_error
+                result["alerts"].append(f"🔴 {plant_name} - Erro ao buscar dados: {error_display}")
+                continue
 
             # Extract values and timestamps
-            production_data = plant_data.get('productPower', {})
-            production_power = float(production_data.get('value') or 0) if isinstance(production_data, dict) else float(production_data or 0)
-            production_time = production_data.get('time') if isinstance(production_data, dict) else None
-            
-            consumption_data = plant_data.get('usePower', {})
-            consumption_power = float(consumption_data.get('value') or 0) if isinstance(consumption_data, dict) else float(consumption_data or 0)
-            consumption_time = consumption_data.get('time') if isinstance(consumption_data, dict) else None
-            
-            grid_data = plant_data.get('meterActivePower', {})
-            grid_power = float(grid_data.get('value') or 0) if isinstance(grid_data, dict) else float(grid_data or 0)
-            grid_time = grid_data.get('time') if isinstance(grid_data, dict) else None
+            (production_power, production_time), (consumption_power, consumption_time), (grid_power, grid_time) = (
+                _latest_value(plant_data, key) for key in _LATEST_VALUE_KEYS
+            )
             
             # Get the most recent timestamp (or any available timestamp)
             last_data_time = production_time or consumption_time or grid_time
             
-            _LOGGER.debug(f"Plant {plant_name} data - Production: {production_power} kW ({production_time}), Consumption: {consumption_power} kW ({consumption_time}), Grid: {grid_power} kW ({grid_time})")
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                _LOGGER.debug(f"Plant {plant_name} data - Production: {production_power} kW ({production_time}), Consumption: {consumption_power} kW ({consumption_time}), Grid: {grid_power} kW ({grid_time})")
 
             # Store original values before potential override
             original_production = production_power
@@ -1237,21 +1565,17 @@ def process_account(account):
             result["grid"] += grid_power
             result["plants"] += 1
 
-            # status
-            if plant['plantStatus'] == 'connected' and production_power != 0 and consumption_power != 0:
-                status_icon = "🟢"
-                error_state = 0
-            elif plant['plantStatus'] == 'disconnected':
-                status_icon = "🟡"
-                error_state = 1
-                
+            # status: (plantStatus, producing, consuming) -> (icon, error_state)
+            status_key = (plant['plantStatus'], production_power != 0, consumption_power != 0)
+            status_icon, error_state = _STATUS_TABLE.get(status_key, _STATUS_DEFAULT)
+
+            if error_state == 1:
                 # Check if disconnected for more than threshold hours
                 if last_data_time:
                     try:
                         # Parse timestamp from "2026-01-15 14:30" format
                         last_data_datetime = datetime.strptime(last_data_time, "%Y-%m-%d %H:%M")
-                        current_datetime = datetime.now()
-                        hours_disconnected = (current_datetime - last_data_datetime).total_seconds() / 3600
+                        hours_disconnected = (now - last_data_datetime).total_seconds() / 3600
                         
                         if hours_disconnected >= DISCONNECTED_RED_THRESHOLD_HOURS:
                             status_icon = "🔴"
@@ -1259,26 +1583,14 @@ def process_account(account):
                     except (ValueError, TypeError) as e:
                         # If timestamp parsing fails, keep yellow status
                         _LOGGER.debug(f"Could not parse timestamp for {plant_name}: {last_data_time}, error: {e}")
-                
-            elif plant['plantStatus'] == 'connected' and production_power != 0 and consumption_power == 0:
-                status_icon = "🟡"
-                error_state = 2
-            elif plant['plantStatus'] == 'connected' and production_power == 0:
-                status_icon = "🟡"
-                error_state = 3
-            else:
-                status_icon = "🟡"
-                error_state = 4
 
-            plant_working_map = {name: code for name, code in list_of_plants}
             if error_state != 0:
-                error_message = error_messages.get(error_state, "Erro desconhecido")
                 # Only override with ⏳ if not already red (🔴)
-                if plant_working_map.get(plant_name) == "1" and status_icon != "🔴":
+                if _PLANT_WORKING_MAP.get(plant_name) == "1" and status_icon != "🔴":
                     status_icon = "⏳"
                 
                 # Build alert message
-                alert_msg = f"{status_icon} {plant_name} - {error_message}"
+                alert_msg = _ALERT_TEMPLATES.get(error_state, _DEFAULT_ALERT_TEMPLATE).format(icon=status_icon, name=plant_name)
                 
                 # Add timestamp for critical alerts (🔴)
                 if status_icon == "🔴" and last_data_time:
@@ -1304,13 +1616,14 @@ def process_account(account):
             active_alarms = []
             if plant['plantStatus'] == 'disconnected':
                 try:
-                    _LOGGER.info(f"🔍 Checking for active alarms in {plant_name} (plant_id: {plant_id}) - plant is disconnected...")
+                    _LOGGER.debug(f"🔍 Checking for active alarms in {plant_name} (plant_id: {plant_id}) - plant is disconnected...")
                     
                     # First, check for plant-level alarms
                     try:
-                        _LOGGER.info(f"Calling get_plant_alarm_data for {plant_name} (plant_id: {plant_id})...")
+                        _LOGGER.debug(f"Calling get_plant_alarm_data for {plant_name} (plant_id: {plant_id})...")
                         plant_alarm_data = client.get_plant_alarm_data(plant_id)
-                        _LOGGER.info(f"get_plant_alarm_data returned for {plant_name}: {type(plant_alarm_data)}, keys: {list(plant_alarm_data.keys()) if isinstance(plant_alarm_data, dict) else 'N/A'}")
+                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                            _LOGGER.debug(f"get_plant_alarm_data returned for {plant_name}: {type(plant_alarm_data)}, keys: {list(plant_alarm_data.keys()) if isinstance(plant_alarm_data, dict) else 'N/A'}")
                         
                         # Parse plant alarm response - flexible structure handling
                         # API can return different structures:
@@ -1370,11 +1683,11 @@ def process_account(account):
                                             _LOGGER.debug(f"   ✅ Found hits using pattern 2 (nested data.data.hits)")
                             
                             if plant_alarms:
-                                _LOGGER.info(f"   ✅ Successfully extracted {len(plant_alarms)} alarm(s) from response")
+                                _LOGGER.debug(f"   ✅ Successfully extracted {len(plant_alarms)} alarm(s) from response")
                             else:
                                 _LOGGER.warning(f"   ❌ Could not find 'hits' array in response structure")
                         
-                        _LOGGER.info(f"Parsed {len(plant_alarms)} plant-level alarm(s) from response for {plant_name}")
+                        _LOGGER.debug(f"Parsed {len(plant_alarms)} plant-level alarm(s) from response for {plant_name}")
                         
                         # Enhanced logging if no alarms found - this will help debug the structure
                         # Debug logging only if no alarms found
@@ -1446,16 +1759,7 @@ def process_account(account):
                                         alarm_time_str = str(occur_time_str)
                                 
                                 # Map severity to emoji (1=Critical, 2=Major, 3=Minor, 4=Warning)
-                                level_emoji = {
-                                    "1": "🔴",  # Critical
-                                    "2": "🟠",  # Major
-                                    "3": "🟡",  # Minor
-                                    "4": "⚪",  # Warning
-                                    "critical": "🔴",
-                                    "major": "🟠",
-                                    "minor": "🟡",
-                                    "warning": "⚪"
-                                }.get(str(severity).lower(), "⚠️")
+                                level_emoji = _ALARM_LEVEL_EMOJI.get(str(severity).lower(), "⚠️")
                                 
                                 active_alarms.append({
                                     "device": "Instalação",
@@ -1467,7 +1771,6 @@ def process_account(account):
                                     "raw_time": occur_time_str or ""
                                 })
                                 _LOGGER.warning(f"🚨 Active plant alarm in {plant_name}: {alarm_name} (Severity {severity}) at {alarm_time_str}")
-                                print(f"    🚨 {plant_name} (Instalação): {alarm_name} (Severidade {severity}) - {alarm_time_str}")
                     except FusionSolarException as plant_alarm_error:
                         error_msg = str(plant_alarm_error)
                         _LOGGER.warning(f"FusionSolar API error getting plant alarms for {plant_name} on first attempt: {error_msg}")
@@ -1476,7 +1779,8 @@ def process_account(account):
                         try:
                             _LOGGER.info(f"Retrying get_plant_alarm_data for {plant_name} after error...")
                             plant_alarm_data = client.get_plant_alarm_data(plant_id)
-                            _LOGGER.info(f"get_plant_alarm_data (retry) returned for {plant_name}: {type(plant_alarm_data)}, keys: {list(plant_alarm_data.keys()) if isinstance(plant_alarm_data, dict) else 'N/A'}")
+                            if _LOGGER.isEnabledFor(logging.DEBUG):
+                                _LOGGER.debug(f"get_plant_alarm_data (retry) returned for {plant_name}: {type(plant_alarm_data)}, keys: {list(plant_alarm_data.keys()) if isinstance(plant_alarm_data, dict) else 'N/A'}")
                             # Re-run parsing logic on retry
                             plant_alarms = []
                             if isinstance(plant_alarm_data, dict):
@@ -1491,7 +1795,7 @@ def process_account(account):
                                         return find_hits(data["data"], f"{path}.data", max_depth-1)
                                     return None
                                 plant_alarms = find_hits(plant_alarm_data) or []
-                            _LOGGER.info(f"Parsed {len(plant_alarms)} plant-level alarm(s) from retry response for {plant_name}")
+                            _LOGGER.debug(f"Parsed {len(plant_alarms)} plant-level alarm(s) from retry response for {plant_name}")
                             if plant_alarms:
                                 # Re-parse alarms with full formatting logic
                                 for alarm in plant_alarms:
@@ -1520,16 +1824,7 @@ def process_account(account):
                                             alarm_time_str = str(occur_time_str)
                                     
                                     # Map severity to emoji
-                                    level_emoji = {
-                                        "1": "🔴",  # Critical
-                                        "2": "🟠",  # Major
-                                        "3": "🟡",  # Minor
-                                        "4": "⚪",  # Warning
-                                        "critical": "🔴",
-                                        "major": "🟠",
-                                        "minor": "🟡",
-                                        "warning": "⚪"
-                                    }.get(str(severity).lower(), "⚠️")
+                                    level_emoji = _ALARM_LEVEL_EMOJI.get(str(severity).lower(), "⚠️")
                                     
                                     active_alarms.append({
                                         "device": "Instalação",
@@ -1546,7 +1841,8 @@ def process_account(account):
                     except Exception as plant_alarm_error:
                         error_msg = str(plant_alarm_error)
                         error_type = type(plant_alarm_error).__name__
-                        _LOGGER.warning(f"Failed to get plant alarms for {plant_name}: {error_type} - {error_msg}", exc_info=True)
+                        _LOGGER.warning("Failed to get plant alarms for %s: %s - %s", plant_name, error_type, error_msg)
+                        _LOGGER.debug("Traceback for plant alarms failure", exc_info=True)
                     
                     # Then, check for inverter alarms
                     # Verify client has get_inverter_ids (monkey-patched method)
@@ -1555,9 +1851,9 @@ def process_account(account):
                         _LOGGER.error(f"get_inverter_ids method not found on client for {plant_name}")
                     else:
                         # Get inverter IDs for this plant
-                        _LOGGER.info(f"Calling get_inverter_ids for {plant_name}...")
+                        _LOGGER.debug(f"Calling get_inverter_ids for {plant_name}...")
                         inverter_ids = client.get_inverter_ids(plant_id)
-                        _LOGGER.info(f"get_inverter_ids returned {len(inverter_ids)} inverter(s) for {plant_name}: {inverter_ids}")
+                        _LOGGER.debug(f"get_inverter_ids returned {len(inverter_ids)} inverter(s) for {plant_name}: {inverter_ids}")
                         
                         if inverter_ids:
                             # Check alarms for each inverter
@@ -1569,9 +1865,10 @@ def process_account(account):
                                     continue
                                 
                                 try:
-                                    _LOGGER.info(f"Calling get_alarm_data for inverter {inverter_id} in {plant_name}...")
+                                    _LOGGER.debug(f"Calling get_alarm_data for inverter {inverter_id} in {plant_name}...")
                                     alarm_data = client.get_alarm_data(device_dn=inverter_id)
-                                    _LOGGER.info(f"get_alarm_data returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
+                                    if _LOGGER.isEnabledFor(logging.DEBUG):
+                                        _LOGGER.debug(f"get_alarm_data returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
                                     
                                     # Parse alarm response - structure: data.data.data.hits[] (same as get_plant_alarm_data)
                                     alarms = []
@@ -1586,7 +1883,7 @@ def process_account(account):
                                                     if not isinstance(alarms, list):
                                                         alarms = []
                                     
-                                    _LOGGER.info(f"Parsed {len(alarms)} alarm(s) from response for {plant_name}")
+                                    _LOGGER.debug(f"Parsed {len(alarms)} alarm(s) from response for {plant_name}")
                                     if len(alarms) == 0 and isinstance(alarm_data, dict):
                                         _LOGGER.debug(f"No alarms found for inverter {inverter_id}. Checking structure...")
                                         if "data" in alarm_data:
@@ -1656,16 +1953,7 @@ def process_account(account):
                                                     alarm_time_str = str(alarm_time)
                                             
                                             # Map severity to emoji (1=Critical, 2=Major, 3=Minor, 4=Warning)
-                                            level_emoji = {
-                                                "1": "🔴",  # Critical
-                                                "2": "🟠",  # Major
-                                                "3": "🟡",  # Minor
-                                                "4": "⚪",  # Warning
-                                                "critical": "🔴",
-                                                "major": "🟠",
-                                                "minor": "🟡",
-                                                "warning": "⚪"
-                                            }.get(str(severity).lower(), "⚠️")
+                                            level_emoji = _ALARM_LEVEL_EMOJI.get(str(severity).lower(), "⚠️")
                                             
                                             active_alarms.append({
                                                 "device": "Inversor",
@@ -1675,7 +1963,6 @@ def process_account(account):
                                                 "emoji": level_emoji
                                             })
                                             _LOGGER.warning(f"🚨 Active alarm in {plant_name} - Inversor: {alarm_name} (Severity {severity}) at {alarm_time_str}")
-                                            print(f"    🚨 {plant_name}: {alarm_name} (Severidade {severity}) - {alarm_time_str}")
                                 except (FusionSolarException, HTTPError) as alarm_error:
                                     error_msg = str(alarm_error)
                                     error_type = type(alarm_error).__name__
@@ -1685,7 +1972,8 @@ def process_account(account):
                                     try:
                                         _LOGGER.info(f"Retrying get_alarm_data for inverter {inverter_id} in {plant_name} after error...")
                                         alarm_data = client.get_alarm_data(device_dn=inverter_id)
-                                        _LOGGER.info(f"get_alarm_data (retry) returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
+                                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                                            _LOGGER.debug(f"get_alarm_data (retry) returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
                                         # Re-run parsing logic on retry (same as first attempt)
                                         alarms = []
                                         if isinstance(alarm_data, dict):
@@ -1697,7 +1985,7 @@ def process_account(account):
                                                         alarms = level2_data["hits"]
                                                         if not isinstance(alarms, list):
                                                             alarms = []
-                                        _LOGGER.info(f"Parsed {len(alarms)} alarm(s) from retry response for {plant_name}")
+                                        _LOGGER.debug(f"Parsed {len(alarms)} alarm(s) from retry response for {plant_name}")
                                         # Process alarms if found
                                         if alarms:
                                             for alarm in alarms:
@@ -1720,10 +2008,7 @@ def process_account(account):
                                                         alarm_time_str = alarm_dt.strftime("%d/%m/%Y %H:%M")
                                                     except Exception:
                                                         alarm_time_str = str(occur_time_str)
-                                                level_emoji = {
-                                                    "1": "🔴", "2": "🟠", "3": "🟡", "4": "⚪",
-                                                    "critical": "🔴", "major": "🟠", "minor": "🟡", "warning": "⚪"
-                                                }.get(str(severity).lower(), "⚠️")
+                                                level_emoji = _ALARM_LEVEL_EMOJI.get(str(severity).lower(), "⚠️")
                                                 active_alarms.append({
                                                     "device": "Inversor",
                                                     "name": alarm_name,
@@ -1732,7 +2017,6 @@ def process_account(account):
                                                     "emoji": level_emoji
                                                 })
                                                 _LOGGER.warning(f"🚨 Active alarm in {plant_name} - Inversor: {alarm_name} (Severity {severity}) at {alarm_time_str}")
-                                                print(f"    🚨 {plant_name}: {alarm_name} (Severidade {severity}) - {alarm_time_str}")
                                         continue
                                     except Exception as retry_dev_error:
                                         retry_msg = str(retry_dev_error)
@@ -1742,13 +2026,15 @@ def process_account(account):
                                 except Exception as alarm_error:
                                     error_msg = str(alarm_error)
                                     error_type = type(alarm_error).__name__
-                                    _LOGGER.warning(f"Failed to get alarms for inverter {inverter_id} in {plant_name}: {error_type} - {error_msg}", exc_info=True)
+                                    _LOGGER.warning("Failed to get alarms for inverter %s in %s: %s - %s", inverter_id, plant_name, error_type, error_msg)
+                                    _LOGGER.debug("Traceback for inverter alarms failure", exc_info=True)
                                     # Retry once after 10 seconds for generic exceptions too
                                     time.sleep(10)
                                     try:
                                         _LOGGER.info(f"Retrying get_alarm_data for inverter {inverter_id} in {plant_name} after generic error...")
                                         alarm_data = client.get_alarm_data(device_dn=inverter_id)
-                                        _LOGGER.info(f"get_alarm_data (retry) returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
+                                        if _LOGGER.isEnabledFor(logging.DEBUG):
+                                            _LOGGER.debug(f"get_alarm_data (retry) returned for {plant_name}: {type(alarm_data)}, keys: {list(alarm_data.keys()) if isinstance(alarm_data, dict) else 'N/A'}")
                                         # Re-run parsing logic on retry
                                         alarms = []
                                         if isinstance(alarm_data, dict):
@@ -1760,7 +2046,7 @@ def process_account(account):
                                                         alarms = level2_data["hits"]
                                                         if not isinstance(alarms, list):
                                                             alarms = []
-                                        _LOGGER.info(f"Parsed {len(alarms)} alarm(s) from retry response for {plant_name}")
+                                        _LOGGER.debug(f"Parsed {len(alarms)} alarm(s) from retry response for {plant_name}")
                                         # Process alarms if found (same logic as above)
                                         if alarms:
                                             for alarm in alarms:
@@ -1783,10 +2069,7 @@ def process_account(account):
                                                         alarm_time_str = alarm_dt.strftime("%d/%m/%Y %H:%M")
                                                     except Exception:
                                                         alarm_time_str = str(occur_time_str)
-                                                level_emoji = {
-                                                    "1": "🔴", "2": "🟠", "3": "🟡", "4": "⚪",
-                                                    "critical": "🔴", "major": "🟠", "minor": "🟡", "warning": "⚪"
-                                                }.get(str(severity).lower(), "⚠️")
+                                                level_emoji = _ALARM_LEVEL_EMOJI.get(str(severity).lower(), "⚠️")
                                                 active_alarms.append({
                                                     "device": "Inversor",
                                                     "name": alarm_name,
@@ -1795,7 +2078,6 @@ def process_account(account):
                                                     "emoji": level_emoji
                                                 })
                                                 _LOGGER.warning(f"🚨 Active alarm in {plant_name} - Inversor: {alarm_name} (Severity {severity}) at {alarm_time_str}")
-                                                print(f"    🚨 {plant_name}: {alarm_name} (Severidade {severity}) - {alarm_time_str}")
                                         continue
                                     except Exception as retry_generic_error:
                                         retry_msg = str(retry_generic_error)
@@ -1804,8 +2086,7 @@ def process_account(account):
                                         continue
                         
                         if active_alarms:
-                            _LOGGER.info(f"Found {len(active_alarms)} active alarm(s) in {plant_name}")
-                            print(f"    ⚠️  {plant_name}: {len(active_alarms)} alarme(s) ativo(s)")
+                            _LOGGER.debug(f"Found {len(active_alarms)} active alarm(s) in {plant_name}")
                             # Add alarms to alerts
                             for alarm in active_alarms:
                                 device_type = alarm.get('device', 'Dispositivo')
@@ -1817,11 +2098,11 @@ def process_account(account):
                 except AttributeError as e:
                     error_msg = str(e)
                     _LOGGER.error(f"Attribute error when checking alarms for {plant_name}: {error_msg}", exc_info=True)
-                    print(f"    ❌ Erro ao verificar alarmes em {plant_name}: método não disponível")
                 except Exception as e:
                     error_msg = str(e)
                     error_type = type(e).__name__
-                    _LOGGER.warning(f"Error checking alarms for {plant_name}: {error_type} - {error_msg}", exc_info=True)
+                    _LOGGER.warning("Error checking alarms for %s: %s - %s", plant_name, error_type, error_msg)
+                    _LOGGER.debug("Traceback for alarm check failure", exc_info=True)
                     # Don't fail the whole process if alarm check fails - just log and continue
                 finally:
                     # If we have any active alarms (plant-level or inverter-level),
@@ -1829,7 +2110,7 @@ def process_account(account):
                     # "Instalação Desligada" alert to avoid duplication.
                     if disconnected_alert_msg:
                         if active_alarms:
-                            _LOGGER.info(
+                            _LOGGER.debug(
                                 f"Skipping generic disconnect alert for {plant_name} because {len(active_alarms)} active alarm(s) were found"
                             )
                         else:
@@ -1891,171 +2172,141 @@ def process_account(account):
                 # Plant is connected, skip alarm check to reduce API calls
                 _LOGGER.debug(f"Skipping alarm check for {plant_name} - plant is connected")
 
-            result["statuses"].append({
-                "name": plant['name'],
-                "pinstalled": installed_capacity,
-                "production": production_power,
-                "consumption": consumption_power,
-                "grid": grid_power,
-                "surplus": surplus_power,
-                "status_icon": status_icon,
-                "last_data_time": last_data_time,  # Timestamp do último dado válido
-                "active_alarms": active_alarms,  # Include alarms for this plant
-                "alarm_count": len(active_alarms)  # Count of active alarms
-            })
+            statuses[i - 1] = PlantStatus(
+                name=plant_name,
+                pinstalled=installed_capacity,
+                production=production_power,
+                consumption=consumption_power,
+                grid=grid_power,
+                surplus=surplus_power,
+                status_icon=status_icon,
+                last_data_time=last_data_time,  # Timestamp do último dado válido
+                active_alarms=active_alarms,  # Include alarms for this plant
+                alarm_count=len(active_alarms)  # Count of active alarms
+            )
 
             # chart data
-            product_power_filtered = [float(x) if x != '--' else 0 for x in plant_stats.get('productPower', [])]
-            consumption_power_filtered = [float(x) if x != '--' else 0 for x in plant_stats.get('usePower', [])]
-            self_use_power_filtered = [float(x) if x != '--' else 0 for x in plant_stats.get('selfUsePower', [])]
-
-            if result["summed_production"] is None:
-                result["summed_production"] = [0] * len(product_power_filtered)
-                result["summed_consumption"] = [0] * len(consumption_power_filtered)
-                result["summed_self_consumption"] = [0] * len(self_use_power_filtered)
-                result["summed_overflow"] = [0] * len(product_power_filtered)
-                result["summed_grid"] = [0] * len(product_power_filtered)  # NOVO
-
-            result["summed_production"] = [
-                round(s + c, 2) for s, c in zip(result["summed_production"], product_power_filtered)
-            ]
-            result["summed_consumption"] = [
-                round(s + c, 2) for s, c in zip(result["summed_consumption"], consumption_power_filtered)
-            ]
-            result["summed_self_consumption"] = [
-                round(s + c, 2) for s, c in zip(result["summed_self_consumption"], self_use_power_filtered)
-            ]
-            result["summed_overflow"] = [
-                round(s + max(prod - cons, 0), 2)
-                for s, prod, cons in zip(result["summed_overflow"], product_power_filtered, consumption_power_filtered)
-            ]
+            _fill_series_row(prod_mat[i - 1], plant_stats.get('productPower', []))
+            _fill_series_row(cons_mat[i - 1], plant_stats.get('usePower', []))
+            _fill_series_row(self_mat[i - 1], plant_stats.get('selfUsePower', []))
+            has_chart_data = True
+
+        if has_chart_data:
+            result["summed_production"] = prod_mat.sum(axis=0)
+            result["summed_consumption"] = cons_mat.sum(axis=0)
+            result["summed_self_consumption"] = self_mat.sum(axis=0)
+            diff_mat = prod_mat - cons_mat
+            clipped = np.maximum(diff_mat, 0)
+            result["summed_overflow"] = clipped.sum(axis=0)
             # NOVO: Consumo da Rede = parte do consumo que vem da rede (quando consumo > produção)
-            result["summed_grid"] = [
-                round(s + max(cons - prod, 0), 2)
-                for s, prod, cons in zip(result["summed_grid"], product_power_filtered, consumption_power_filtered)
-            ]
+            # max(-d, 0) == max(d, 0) - d, computed in place to reuse the buffer
+            clipped -= diff_mat
+            result["summed_grid"] = clipped.sum(axis=0)
 
         # Don't log out - keep session alive for reuse
         # client.log_out()  # Commented out to maintain session
         _LOGGER.info(f"Successfully processed account {USER}: {result['plants']} plants, Total production: {result['production']:.2f} kW, Total consumption: {result['consumption']:.2f} kW")
-        print(f"✓ Completed processing {USER}: {result['plants']} plants processed")
+        _store_account_result(USER, result)
         return result
 
     except Exception as e:
         error_msg = str(e)
         error_type = type(e).__name__
         _LOGGER.error(f"Unexpected error processing account {USER}: {error_type} - {error_msg}", exc_info=True)
-        print(f"❌ Erro no processamento da conta {USER}: {error_type}: {error_msg}")
+        # Drop rows for plants that were never reached
+        result["statuses"] = [s for s in result["statuses"] if s is not None]
         # Add account-level error to alerts so it's visible in the UI
         result["alerts"].append(f"🔴 Conta {USER} - Erro ao processar: {error_msg[:100]}")
-        return result
+        return _account_fallback(USER, result)
         
+# Chart timeslots for a full day (5-minute steps), built once at import
+_X_AXIS = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in range(0, 60, 5))
+
+def _chart_slot(now):
+    """Index of the 5-minute chart timeslot containing `now` (0 = 00:00)"""
+    return now.hour * 12 + now.minute // 5
+
+def _x_axis_until(now):
+    """Chart timeslots from 00:00 up to and including the slot containing `now`"""
+    return list(_X_AXIS[:_chart_slot(now) + 1])
+
 def _fetch_live_data():
     """Internal function to actually fetch data from Fusion Solar API"""
+    # Single clock reading for the whole refresh: plant requests, x-axis cutoff and last_updated
+    now = datetime.now()
     try:
         _LOGGER.info("="*60)
         _LOGGER.info("Starting data fetch from Fusion Solar API")
         _LOGGER.info(f"Processing {len(accounts)} accounts in parallel")
-        print("\n" + "="*60)
-        print("Starting data fetch from Fusion Solar API")
-        print(f"Processing {len(accounts)} accounts...")
-        print("="*60)
         
         total_production = total_consumption = total_grid = total_plants = 0
         statuses = []
         zero_production_plants = []
-        summed_production = summed_consumption = summed_self_consumption = summed_overflow = None
-        summed_grid = None  # NOVO
+        chart_results = []  # account results that carry chart series, reduced after the loop
         account_summaries = []  # Track stations per account
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = {executor.submit(process_account, acc): acc for acc in accounts}
-            for f in as_completed(futures):
-                account = futures[f]
-                r = f.result()
-                total_production += r["production"]
-                total_consumption += r["consumption"]
-                total_grid += r["grid"]
-                total_plants += r["plants"]
-                statuses.extend(r["statuses"])
-                zero_production_plants.extend(r["alerts"])
-                account_summaries.append({
-                    "account": account[0],
-                    "plants": r["plants"]
-                })
-                
-                # merge charts
-                if r["summed_production"] is not None:
-                    if summed_production is None:
-                        summed_production = r["summed_production"]
-                        summed_consumption = r["summed_consumption"]
-                        summed_self_consumption = r["summed_self_consumption"]
-                        summed_overflow = r["summed_overflow"]
-                        summed_grid = r.get("summed_grid")  # NOVO
-                    else:
-                        summed_production = [a + b for a, b in zip(summed_production, r["summed_production"])]
-                        summed_consumption = [a + b for a, b in zip(summed_consumption, r["summed_consumption"])]
-                        summed_self_consumption = [a + b for a, b in zip(summed_self_consumption, r["summed_self_consumption"])]
-                        summed_overflow = [a + b for a, b in zip(summed_overflow, r["summed_overflow"])]
-                        # NOVO: combinar summed_grid
-                        if summed_grid is not None and r.get("summed_grid") is not None:
-                            summed_grid = [a + b for a, b in zip(summed_grid, r["summed_grid"])]
-                        elif summed_grid is None and r.get("summed_grid") is not None:
-                            summed_grid = r["summed_grid"]
-
-        # Print summary of installations per account
-        _LOGGER.info("="*60)
-        _LOGGER.info("DATA FETCH SUMMARY")
-        _LOGGER.info(f"Total production: {total_production:.2f} kW")
-        _LOGGER.info(f"Total consumption: {total_consumption:.2f} kW")
-        _LOGGER.info(f"Total grid: {total_grid:.2f} kW")
-        _LOGGER.info(f"Total installations: {total_plants}")
-        print("\n" + "="*60)
-        print("INSTALLATION SUMMARY")
-        print("="*60)
-        for summary in account_summaries:
-            print(f"  {summary['account']}: {summary['plants']} installations")
-            _LOGGER.info(f"Account {summary['account']}: {summary['plants']} installations")
-        print(f"\n  TOTAL INSTALLATIONS: {total_plants}")
-        print(f"  Expected in list_of_plants: {len(list_of_plants)}")
-        print(f"  Total Production: {total_production:.2f} kW")
-        print(f"  Total Consumption: {total_consumption:.2f} kW")
-        print("="*60 + "\n")
+        # Accounts refreshed very recently are served from the per-account cache
+        recent_results = []
+        futures = {}
+        for acc in accounts:
+            cached = _get_cached_account_result(acc[0], ACCOUNT_CACHE_MIN_REFRESH)
+            if cached is not None:
+                _LOGGER.debug(f"Using recent cached result for account {acc[0]}")
+                recent_results.append((acc, cached))
+            else:
+                futures[_account_executor.submit(process_account, acc, now)] = acc
+        fetched_results = ((futures[f], f.result()) for f in as_completed(futures))
+        for account, r in itertools.chain(recent_results, fetched_results):
+            total_production += r["production"]
+            total_consumption += r["consumption"]
+            total_grid += r["grid"]
+            total_plants += r["plants"]
+            statuses.extend(r["statuses"])
+            zero_production_plants.extend(r["alerts"])
+            account_summaries.append({
+                "account": account[0],
+                "plants": r["plants"]
+            })
+            
+            if r["summed_production"] is not None:
+                chart_results.append(r)
+
+        # merge charts: one reduction per series across all accounts
+        summed_production = _sum_series([r["summed_production"] for r in chart_results])
+        summed_consumption = _sum_series([r["summed_consumption"] for r in chart_results])
+        summed_self_consumption = _sum_series([r["summed_self_consumption"] for r in chart_results])
+        summed_overflow = _sum_series([r["summed_overflow"] for r in chart_results])
+        # NOVO: combinar summed_grid
+        summed_grid = _sum_series([r["summed_grid"] for r in chart_results if r.get("summed_grid") is not None])
+
+        # Summary of installations per account, emitted as a single log record
+        if _LOGGER.isEnabledFor(logging.INFO):
+            _LOGGER.info("\n".join([
+                "DATA FETCH SUMMARY",
+                *(f"  {summary['account']}: {summary['plants']} installations" for summary in account_summaries),
+                f"  Total installations: {total_plants} (expected in list_of_plants: {len(list_of_plants)})",
+                f"  Total production: {total_production:.2f} kW",
+                f"  Total consumption: {total_consumption:.2f} kW",
+                f"  Total grid: {total_grid:.2f} kW",
+            ]))
         
         alert_message = "✅ Todas as instalações estão a funcionar normalmente."
         if zero_production_plants:
             # Sort alerts by priority: 🔴 (critical) first, then 🟠 (major), then ⏳, then 🟡 (minor), then ⚪ (warning), then ⚠️
-            def alert_priority(alert):
-                if alert.startswith("🔴"):
-                    return 0  # Highest priority - Critical
-                elif alert.startswith("🟠"):
-                    return 1  # Major alarms
-                elif alert.startswith("⏳"):
-                    return 2  # In maintenance
-                elif alert.startswith("🟡"):
-                    return 3  # Minor alarms
-                elif alert.startswith("⚪"):
-                    return 4  # Warning alarms
-                elif alert.startswith("⚠️"):
-                    return 5
-                else:
-                    return 6  # Lowest priority
-            
-            zero_production_plants.sort(key=alert_priority)
+            zero_production_plants.sort(key=_alert_priority)
             alert_message = "As seguintes instalações estão com problemas:\n" + "\n".join([f"- {p}" for p in zero_production_plants])
 
-        current_time = datetime.now().strftime('%H:%M')
-        x_axis = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(0, 60, 5)]
-        filtered_axis = [t for t in x_axis if t <= current_time]
+        filtered_axis = _x_axis_until(now)
         n = len(filtered_axis)
 
         # Ensure chart data is always arrays, never None
+        # Rounding happens once here, after all plants/accounts have been summed
         if summed_production is not None:
-            summed_production = summed_production[:n]
-            summed_consumption = summed_consumption[:n]
-            summed_self_consumption = summed_self_consumption[:n]
-            summed_overflow = summed_overflow[:n]
-            summed_grid = summed_grid[:n] if summed_grid is not None else []  # NOVO
+            summed_production = _chart_list(summed_production[:n])
+            summed_consumption = _chart_list(summed_consumption[:n])
+            summed_self_consumption = _chart_list(summed_self_consumption[:n])
+            summed_overflow = _chart_list(summed_overflow[:n])
+            summed_grid = _chart_list(summed_grid[:n]) if summed_grid is not None else []  # NOVO
         else:
             # If no chart data available, use empty arrays
             summed_production = []
@@ -2064,9 +2315,6 @@ def _fetch_live_data():
             summed_overflow = []
             summed_grid = []  # NOVO
 
-        # Get current timestamp for last updated
-        last_updated_datetime = datetime.now()
-        
         return {
             "production": round(total_production, 2),
             "consumption": round(total_consumption, 2),
@@ -2083,28 +2331,28 @@ def _fetch_live_data():
                 "surplus": summed_overflow
             },
             "alerts": zero_production_plants,
-            "last_updated": last_updated_datetime.strftime('%Y-%m-%d %H:%M:%S'),
-            "last_updated_timestamp": last_updated_datetime.timestamp()
+            "last_updated": now.strftime('%Y-%m-%d %H:%M:%S'),
+            "last_updated_timestamp": now.timestamp()
         }
 
     except Exception as e:
         error_msg = str(e)
         error_type = type(e).__name__
         _LOGGER.error(f"Critical error in _fetch_live_data: {error_type} - {error_msg}", exc_info=True)
-        print(f"❌ Critical error in data fetch: {error_type}: {error_msg}")
         return {"error": "Erro ao carregar dados 😞"}
 
-def _update_chart_x_axis_for_current_time(cached_data):
+def _serialize_live_data(data):
+    """Convert PlantStatus rows to plain dicts right before the JSON response"""
+    return {**data, "statuses": [asdict(s) for s in data.get("statuses", [])]}
+
+def _update_chart_x_axis_for_current_time(cached_data, now):
     """
     Update the chart x_axis and pad data arrays with null values for time points
     that have passed since the data was cached, but don't have data yet.
+    `now` is the request's clock reading (datetime).
     """
-    from datetime import datetime
-    current_time_str = datetime.now().strftime('%H:%M')
-    
-    # Generate full x_axis up to current time
-    x_axis = [f"{h:02d}:{m:02d}" for h in range(24) for m in range(0, 60, 5)]
-    filtered_axis = [t for t in x_axis if t <= current_time_str]
+    # x_axis up to current time
+    filtered_axis = _x_axis_until(now)
     
     if "chart" not in cached_data or not cached_data["chart"]:
         return cached_data
@@ -2131,47 +2379,217 @@ def _update_chart_x_axis_for_current_time(cached_data):
     
     return cached_data
 
+def _refresh_live_data():
+    """Fetch fresh data from Fusion Solar and swap it into _data_cache if successful"""
+    fresh_data = _fetch_live_data()
+    
+    # Check if there was an error
+    if "error" in fresh_data:
+        _LOGGER.error("Data fetch returned error, not caching")
+        return fresh_data
+    
+    # Update cache with successful data
+    with _data_cache["lock"]:
+        _data_cache["data"] = fresh_data
+        _data_cache["timestamp"] = time.time()
+        _data_cache["updated"].notify_all()
+    last_updated_str = fresh_data.get('last_updated', 'N/A')
+    _LOGGER.info(f"✅ Data successfully updated at {last_updated_str}. Total plants: {fresh_data.get('total_plants', 0)}")
+    return fresh_data
+
+def _background_refresh():
+    """Refresh thread target: always clears the in-progress flag when done"""
+    try:
+        _refresh_live_data()
+    except Exception as e:
+        _LOGGER.error(f"Background refresh failed: {type(e).__name__} - {e}", exc_info=True)
+    finally:
+        with _data_cache["lock"]:
+            _data_cache["refreshing"] = False
+            _data_cache["updated"].notify_all()
+
+def _start_background_refresh():
+    """Start a background refresh unless one is already running. Returns True if started."""
+    with _data_cache["lock"]:
+        if _data_cache["refreshing"]:
+            return False
+        _data_cache["refreshing"] = True
+    threading.Thread(target=_background_refresh, name="live-data-refresh", daemon=True).start()
+    return True
+
+def _periodic_refresh():
+    """Refresher thread: fetch once at startup, then every BACKGROUND_REFRESH_INTERVAL seconds"""
+    while True:
+        with _data_cache["lock"]:
+            claimed = not _data_cache["refreshing"]
+            if claimed:
+                _data_cache["refreshing"] = True
+        if claimed:
+            # Holding cold_start_lock makes a first request wait for this fetch instead of
+            # starting its own
+            with _data_cache["cold_start_lock"]:
+                _background_refresh()
+        time.sleep(BACKGROUND_REFRESH_INTERVAL)
+
+_refresher_thread = None
+_refresher_lock = threading.Lock()
+
+def start_background_refresher():
+    """
+    Start the periodic refresher thread (once per process). Not started on import: it is
+    called from the gunicorn worker hook (gunicorn.conf.py) or the dev server entry point,
+    so tools that just import the module don't log in to every account.
+    """
+    global _refresher_thread
+    with _refresher_lock:
+        if _refresher_thread is None:
+            _refresher_thread = threading.Thread(target=_periodic_refresh, name="live-data-refresher", daemon=True)
+            _refresher_thread.start()
+            _LOGGER.info(f"Background refresher started (every {BACKGROUND_REFRESH_INTERVAL}s)")
+    return _refresher_thread
+
+def _live_data_body(cached_data, data_timestamp, now):
+    """
+    Serialized live-data payload for `now`. The payload only changes when the data is swapped
+    or a new 5-minute chart slot starts, so callers within that window share one body.
+    """
+    body_key = (data_timestamp, _chart_slot(now))
+    with _data_cache["lock"]:
+        body = _data_cache["body"] if _data_cache["body_key"] == body_key else None
+
+    if body is None:
+        # Update x_axis to current time (adds null values for new time points)
+        # Use deepcopy to avoid modifying the original cached data
+        cached_data_copy = copy.deepcopy(cached_data)
+        cached_data_copy = _update_chart_x_axis_for_current_time(cached_data_copy, now)
+        body = _json_bytes(_serialize_live_data(cached_data_copy))
+        with _data_cache["lock"]:
+            _data_cache["body"] = body
+            _data_cache["body_key"] = body_key
+            _data_cache["body_gz"] = None
+    return body
+
+def _gzip_live_body(body):
+    """
+    gzip-encoded copy of a live-data body. Compressed once per body and shared by every
+    request until the body changes, instead of Flask-Compress re-encoding it per request.
+    """
+    with _data_cache["lock"]:
+        if _data_cache["body"] is body and _data_cache["body_gz"] is not None:
+            return _data_cache["body_gz"]
+
+    body_gz = gzip.compress(body, compresslevel=6)
+    with _data_cache["lock"]:
+        if _data_cache["body"] is body:
+            _data_cache["body_gz"] = body_gz
+    return body_gz
+
 @app.route("/api/live-data")
 def live_data():
-    """API endpoint with caching to reduce Fusion Solar API calls"""
+    """
+    API endpoint with caching to reduce Fusion Solar API calls.
+    Stale-while-revalidate: once the cache expires, the stale data is served immediately
+    while a single background thread fetches fresh data. Only a cold start blocks.
+    """
     current_time = time.time()
-    
-    # Check if we have cached data that's still valid
     with _data_cache["lock"]:
-        cache_age = current_time - _data_cache["timestamp"]
-        
-        if _data_cache["data"] is not None and cache_age < CACHE_DURATION:
-            # Update x_axis to current time (adds null values for new time points)
-            # Use deepcopy to avoid modifying the original cached data
-            cached_data_copy = copy.deepcopy(_data_cache["data"])
-            cached_data_copy = _update_chart_x_axis_for_current_time(cached_data_copy)
-            _LOGGER.info(f"Returning cached data (age: {int(cache_age)}s, remaining: {int(CACHE_DURATION - cache_age)}s)")
-            print(f"📦 Returning cached data (age: {int(cache_age)}s)")
-            return jsonify(cached_data_copy)
-        
-        # Cache expired or doesn't exist, fetch fresh data
-        _LOGGER.info("Cache expired or missing, fetching fresh data from Fusion Solar API...")
-        print("🔄 Cache expired or missing, fetching fresh data from Fusion Solar API...")
-        fresh_data = _fetch_live_data()
-        
-        # Check if there was an error
-        if "error" in fresh_data:
-            _LOGGER.error("Data fetch returned error, not caching")
-            # Return error immediately without caching
-            return jsonify(fresh_data), 500
-        
-        # Update cache with successful data
-        _data_cache["data"] = fresh_data
-        _data_cache["timestamp"] = current_time
-        last_updated_str = fresh_data.get('last_updated', 'N/A')
-        _LOGGER.info(f"✅ Data successfully updated at {last_updated_str}. Total plants: {fresh_data.get('total_plants', 0)}")
-        print(f"✅ Data successfully updated at {last_updated_str}")
-        
-        return jsonify(fresh_data)
+        cached_data = _data_cache["data"]
+        data_timestamp = _data_cache["timestamp"]
+        cache_age = current_time - data_timestamp
+    
+    if cached_data is None:
+        # Cold start: fetch synchronously, one request at a time
+        with _data_cache["cold_start_lock"]:
+            with _data_cache["lock"]:
+                cached_data = _data_cache["data"]
+            if cached_data is None:
+                _LOGGER.info("Cache missing, fetching fresh data from Fusion Solar API...")
+                fresh_data = _refresh_live_data()
+                if "error" in fresh_data:
+                    # Return error immediately without caching
+                    return jsonify(fresh_data), 500
+                return jsonify(_serialize_live_data(fresh_data))
+            with _data_cache["lock"]:
+                data_timestamp = _data_cache["timestamp"]
+        cache_age = 0
+    
+    if cache_age >= CACHE_DURATION and _start_background_refresh():
+        _LOGGER.info(f"Cache expired (age: {int(cache_age)}s), refreshing in background and serving stale data")
+    
+    if cache_age >= CACHE_HARD_MAX_AGE:
+        # Too old to serve without trying: wait for the refresh (ours or one already running)
+        with _data_cache["lock"]:
+            _data_cache["updated"].wait_for(
+                lambda: _data_cache["timestamp"] != data_timestamp or not _data_cache["refreshing"],
+                timeout=CACHE_HARD_WAIT,
+            )
+            cached_data = _data_cache["data"]
+            data_timestamp = _data_cache["timestamp"]
+        current_time = time.time()
+        cache_age = current_time - data_timestamp
+    
+    body = _live_data_body(cached_data, data_timestamp, datetime.fromtimestamp(current_time))
+    _LOGGER.debug(f"Returning cached data (age: {int(cache_age)}s)")
+    # Serve the pre-gzipped copy only if the client accepts gzip (a "gzip;q=0" entry refuses it)
+    if request.accept_encodings["gzip"] > 0:
+        response = app.response_class(_gzip_live_body(body), mimetype="application/json")
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = app.response_class(body, mimetype="application/json")
+    response.vary.add("Accept-Encoding")
+    return response
+
+@app.route("/api/live-stream")
+def live_stream():
+    """
+    Server-Sent Events version of /api/live-data: sends the current payload on connect and
+    again whenever the cache is refreshed or a new chart slot starts, instead of the
+    browser polling. Needs a server that can hold connections open (threaded workers).
+    At most LIVE_STREAM_MAX_CLIENTS streams are served at once; further clients get 503.
+    """
+    if not _live_stream_slots.acquire(blocking=False):
+        return jsonify({"error": "Too many live streams, use /api/live-data"}), 503
+
+    def events():
+        sent_key = None
+        deadline = time.time() + LIVE_STREAM_MAX_AGE
+        while time.time() < deadline:
+            current_time = time.time()
+            with _data_cache["lock"]:
+                cached_data = _data_cache["data"]
+                data_timestamp = _data_cache["timestamp"]
+            if cached_data is None or current_time - data_timestamp >= CACHE_DURATION:
+                # Nobody may be polling /api/live-data, so trigger the refresh from here
+                _start_background_refresh()
+            if cached_data is not None:
+                now = datetime.fromtimestamp(current_time)
+                key = (data_timestamp, _chart_slot(now))
+                if key != sent_key:
+                    sent_key = key
+                    body = _live_data_body(cached_data, data_timestamp, now)
+                    # One "data:" line per payload line (the payload is normally a single line)
+                    yield b"".join(b"data: " + line + b"\n" for line in body.split(b"\n")) + b"\n"
+            with _data_cache["lock"]:
+                if _data_cache["timestamp"] == data_timestamp:
+                    _data_cache["updated"].wait(LIVE_STREAM_KEEPALIVE)
+            yield b": keep-alive\n\n"
+
+    response = app.response_class(
+        events(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Released when the server closes the response (stream ended or client went away)
+    response.call_on_close(_live_stream_slots.release)
+    return response
 
 if __name__ == "__main__":
     # Only run Flask dev server if executed directly (not via gunicorn)
     # Gunicorn imports app:app directly, so this block is skipped in production
+    # (there the refresher is started by the worker hook in gunicorn.conf.py).
+    # Under the reloader only the child process (WERKZEUG_RUN_MAIN) serves requests
+    if BACKGROUND_REFRESH_ENABLED and os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_background_refresher()
     app.run(debug=True)
 
 
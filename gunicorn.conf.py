@@ -0,0 +1,9 @@
+# Gunicorn settings used by the Procfile (worker/thread counts stay on the command line)
+
+
+def post_worker_init(worker):
+    """Start the live-data background refresher in each worker, after the app is loaded"""
+    import app
+
+    if app.BACKGROUND_REFRESH_ENABLED:
+        app.start_background_refresher()
@@ -205,7 +205,20 @@ async function fetchLiveData() {
     }
     
     const data = await response.json();
+    applyLiveData(data);
+  } catch (error) {
+    console.error("Erro ao buscar dados:", error);
+    // Update connection status to disconnected
+    updateConnectionStatus(false);
+    // Hide updating indicator even on error
+    hideUpdatingIndicator();
+    // Still reset countdown so it continues (will retry in 5 minutes)
+    nextUpdateTime = Date.now() + UPDATE_INTERVAL_MS;
+  }
+}
 
+// Render a /api/live-data payload (from a poll or a /api/live-stream event)
+function applyLiveData(data) {
     if (data.error) {
       console.error("API Error:", data.error);
       updateConnectionStatus(false);
@@ -433,15 +446,6 @@ async function fetchLiveData() {
       document.getElementById("loading-overlay")?.classList.add("hidden");
       firstLoad = false;
     }	
-  } catch (error) {
-    console.error("Erro ao buscar dados:", error);
-    // Update connection status to disconnected
-    updateConnectionStatus(false);
-    // Hide updating indicator even on error
-    hideUpdatingIndicator();
-    // Still reset countdown so it continues (will retry in 5 minutes)
-    nextUpdateTime = Date.now() + UPDATE_INTERVAL_MS;
-  }
 }
 
 // Update connection status indicator (integrated in update widget)
@@ -478,15 +482,50 @@ function updateConnectionStatus(success) {
   }
 }
 
-// Run once on load
-fetchLiveData();
+// Poll /api/live-data every 5 minutes (used when the live stream is unavailable)
+function startPolling() {
+  fetchLiveData();
+  setInterval(fetchLiveData, UPDATE_INTERVAL_MS);
+}
+
+// Receive updates pushed by the server over Server-Sent Events.
+// Returns false if the browser has no EventSource support.
+function startLiveStream() {
+  if (!window.EventSource) return false;
+
+  let received = false;
+  const source = new EventSource("/api/live-stream");
+  source.onmessage = (event) => {
+    received = true;
+    stopAutoScroll();
+    try {
+      applyLiveData(JSON.parse(event.data));
+    } catch (error) {
+      console.error("Erro ao processar dados:", error);
+      updateConnectionStatus(false);
+    }
+  };
+  source.onerror = () => {
+    updateConnectionStatus(false);
+    if (!received || source.readyState === EventSource.CLOSED) {
+      // Stream never worked (e.g. not supported by the server/proxy) or the server
+      // refused the reconnect (503 when too many streams are open): fall back to polling
+      source.close();
+      startPolling();
+    }
+    // Otherwise EventSource reconnects by itself
+  };
+  return true;
+}
+
+// Prefer server push; fall back to polling
+if (!startLiveStream()) {
+  startPolling();
+}
 
 // Start countdown timer
 startCountdown();
 
-// Refresh every 5 minutes
-setInterval(fetchLiveData, UPDATE_INTERVAL_MS);
-
 
 
 // Weather fetch (Open-Meteo)
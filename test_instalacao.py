@@ -27,6 +27,23 @@ USO:
     python test_instalacao.py "Oficinas Domus"
     
     Se não fornecer o nome, será usado o valor do .env (PLANT_NAME) ou o padrão.
+    
+    Com --quiet (-q) só são mostrados os erros e o resumo final.
+    
+    Com --cache, as respostas recentes ficam guardadas em test_results/.cache e são
+    reutilizadas nas execuções seguintes enquanto não expirarem (ver CACHE_TTL_BY_METHOD).
+    
+    Com --zip, todos os resultados da execução são guardados num único arquivo
+    test_results/<timestamp>_resultados.zip (um JSON por chamada dentro do arquivo).
+    Com --jsonl, são guardados em test_results/<timestamp>_resultados.jsonl, um resultado
+    por linha com o campo "name" a identificar a chamada.
+    
+    Defina DUMP_ALL_STATIONS=1 para guardar em 02_plant_info os dados completos de todas
+    as estações da conta (por omissão só são guardados os nomes).
+    
+    Defina ADEP_MAX_CONCURRENCY=N para limitar o número de pedidos simultâneos à API
+    durante os testes de uma instalação (por omissão 6), por exemplo se a API começar
+    a responder com 429 (demasiados pedidos).
 
 O script irá:
     1. Fazer login na conta especificada
@@ -46,7 +63,13 @@ import io
 import json
 import os
 import argparse
+import hashlib
+import threading
+import zipfile
 from datetime import datetime, timedelta
+from decimal import Decimal
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Set UTF-8 encoding for stdout/stderr to handle emojis on Windows
@@ -54,15 +77,26 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from fusion_solar_py.client import FusionSolarClient
 from fusion_solar_py.exceptions import FusionSolarException
 import time
+import itertools
 import logging
+import numpy as np
 
 # Configure logging to reduce spam from fusion_solar_py library
 # Silence the "parsing MAX JS NUMBER" warnings (these are expected when API returns no data)
 logging.getLogger("fusion_solar_py.client").setLevel(logging.ERROR)
 
+# Tentar importar orjson (serialização/deserialização JSON mais rápida)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Tentar importar python-dotenv
 try:
     from dotenv import load_dotenv
@@ -72,55 +106,86 @@ except ImportError:
     print("⚠️  python-dotenv não está instalado. Instale com: pip install python-dotenv")
     print("   Continuando sem suporte a .env...")
 
+# Parâmetro "_" (anti-cache) dos pedidos GET: basta ser diferente em cada pedido, por isso
+# usa-se um contador a partir do instante de arranque em vez de ler o relógio a cada chamada
+_cache_buster = itertools.count(round(time.time() * 1000))
+
+def _decode_json(r):
+    """Descodifica o corpo de uma resposta da API, usando orjson quando disponível"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(r.content)
+    return r.json()
+
 # Monkey-patch: Adicionar métodos que são usados no app.py mas não existem no cliente original
+# Endpoints da API usados pelos métodos abaixo (relativos a https://<subdomínio>.fusionsolar.huawei.com)
+STATION_LIST_PATH = "/rest/pvms/web/station/v1/station/station-list"
+ENERGY_BALANCE_PATH = "/rest/pvms/web/station/v1/overview/energy-balance"
+ALARM_QUERY_PATH = "/rest/pvms/fm/v1/query"
+DEVICE_LIST_PATH = "/rest/neteco/web/config/device/v1/device-list"
+
+def _api_url(self, path: str) -> str:
+    """URL completo de um endpoint no subdomínio do cliente"""
+    return f"https://{self._huawei_subdomain}.fusionsolar.huawei.com{path}"
+
+# Número máximo de páginas da lista de estações pedidas em simultâneo
+STATION_PAGE_WORKERS = 8
+
+def _fetch_station_page(self, query: dict, cur_page: int) -> dict:
+    """Obtém uma página da lista de estações e devolve o campo "data" da resposta"""
+    r = self._session.post(url=_api_url(self, STATION_LIST_PATH), json={**query, "curPage": cur_page})
+    r.raise_for_status()
+    obj_tree = _decode_json(r)
+    if not obj_tree["success"]:
+        raise Exception("Failed to retrieve station list")
+    return obj_tree["data"]
+
 def custom_get_station_list(self) -> list:
-    """Get all stations with pagination support"""
-    all_stations = []
+    """Get all stations with pagination support.
+    The first page gives the page count; the remaining pages are fetched in parallel.
+    """
     page_size = 50
-    cur_page = 1
+    # Parte fixa do pedido, igual em todas as páginas (só curPage muda)
+    query = {
+        "pageSize": page_size,
+        "gridConnectedTime": "",
+        "queryTime": self._get_day_start_sec(),
+        "timeZone": 2,
+        "sortId": "createTime",
+        "sortDir": "DESC",
+        "locale": "en_US"
+    }
+    
+    data = _fetch_station_page(self, query, 1)
+    all_stations = list(data["list"])
+    # If we got fewer stations than page_size, there is only one page
+    if len(all_stations) < page_size:
+        return all_stations
+    
+    total = data.get("total", 0)
+    total_pages = data.get("pageCount", 0)
+    if total_pages <= 0 and total > 0:
+        total_pages = -(-total // page_size)
     
+    if total_pages > 1:
+        with ThreadPoolExecutor(max_workers=min(STATION_PAGE_WORKERS, total_pages - 1)) as executor:
+            pages = executor.map(
+                lambda page: _fetch_station_page(self, query, page)["list"],
+                range(2, total_pages + 1),
+            )
+            for stations in pages:  # map() devolve as páginas pela ordem
+                all_stations.extend(stations)
+        return all_stations
+    if total_pages == 1:
+        return all_stations
+    
+    # Sem pageCount/total: percorrer as páginas sequencialmente até uma vir incompleta
+    cur_page = 1
     while True:
-        r = self._session.post(
-            url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/station/station-list",
-            json={
-                "curPage": cur_page,
-                "pageSize": page_size,
-                "gridConnectedTime": "",
-                "queryTime": self._get_day_start_sec(),
-                "timeZone": 2,
-                "sortId": "createTime",
-                "sortDir": "DESC",
-                "locale": "en_US"
-            }
-        )
-        r.raise_for_status()
-        obj_tree = r.json()
-        if not obj_tree["success"]:
-            raise Exception("Failed to retrieve station list")
-        
-        stations = obj_tree["data"]["list"]
-        if not stations:  # No more stations
-            break
-            
+        cur_page += 1
+        stations = _fetch_station_page(self, query, cur_page)["list"]
         all_stations.extend(stations)
-        
-        # Check if there are more pages
-        total = obj_tree["data"].get("total", 0)
-        total_pages = obj_tree["data"].get("pageCount", 0)
-        
-        # If we got fewer stations than page_size, we're on the last page
         if len(stations) < page_size:
             break
-            
-        # If total_pages is provided and we've reached it, stop
-        if total_pages > 0 and cur_page >= total_pages:
-            break
-            
-        # If we've fetched all stations based on total count, stop
-        if total > 0 and len(all_stations) >= total:
-            break
-            
-        cur_page += 1
     
     return all_stations
 
@@ -139,18 +204,18 @@ def get_plant_stats_monthly(self, plant_id: str, query_time: int = None) -> dict
         query_time = self._get_day_start_sec()
         
     r = self._session.get(
-        url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
+        url=_api_url(self, ENERGY_BALANCE_PATH),
         params={
             "stationDn": plant_id,
             "timeDim": 5,
             "queryTime": query_time,
             "timeZone": 2,  # 1 in no daylight
             "timeZoneStr": "Europe/Vienna",
-            "_": round(time.time() * 1000),
+            "_": next(_cache_buster),
         },
     )
     r.raise_for_status()
-    plant_data = r.json()
+    plant_data = _decode_json(r)
 
     if not plant_data["success"] or "data" not in plant_data:
         raise FusionSolarException(
@@ -175,18 +240,18 @@ def get_plant_stats_yearly(self, plant_id: str, query_time: int = None) -> dict:
         query_time = self._get_day_start_sec()
         
     r = self._session.get(
-        url=f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/web/station/v1/overview/energy-balance",
+        url=_api_url(self, ENERGY_BALANCE_PATH),
         params={
             "stationDn": plant_id,
             "timeDim": 6,
             "queryTime": query_time,
             "timeZone": 2,  # 1 in no daylight
             "timeZoneStr": "Europe/Vienna",
-            "_": round(time.time() * 1000),
+            "_": next(_cache_buster),
         },
     )
     r.raise_for_status()
-    plant_data = r.json()
+    plant_data = _decode_json(r)
 
     if not plant_data["success"] or "data" not in plant_data:
         raise FusionSolarException(
@@ -204,7 +269,7 @@ def get_plant_alarm_data(self, plant_id: str) -> dict:
     :return: Alarm data for the plant
     :rtype: dict
     """
-    url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/pvms/fm/v1/query"
+    url = _api_url(self, ALARM_QUERY_PATH)
     request_data = {
         "dataType": "CURRENT",
         "domainType": "OC_SOLAR",
@@ -214,7 +279,7 @@ def get_plant_alarm_data(self, plant_id: str) -> dict:
     }
     r = self._session.post(url=url, json=request_data)
     r.raise_for_status()
-    return r.json()
+    return _decode_json(r)
 
 # Método para obter dispositivos de uma instalação específica
 def get_device_ids_for_plant(self, plant_id: str) -> list:
@@ -224,22 +289,55 @@ def get_device_ids_for_plant(self, plant_id: str) -> list:
     :return: List of devices with type and deviceDn
     :rtype: list
     """
-    url = f"https://{self._huawei_subdomain}.fusionsolar.huawei.com/rest/neteco/web/config/device/v1/device-list"
+    url = _api_url(self, DEVICE_LIST_PATH)
     params = {
         "conditionParams.parentDn": plant_id,  # Use plant_id instead of company_id
         "conditionParams.mocTypes": "20814,20815,20816,20819,20822,50017,60066,60014,60015,23037",
-        "_": round(time.time() * 1000),
+        "_": next(_cache_buster),
     }
     r = self._session.get(url=url, params=params)
     r.raise_for_status()
-    device_data = r.json()
+    device_data = _decode_json(r)
 
     devices = []
     for device in device_data.get("data", []):
         devices.append(dict(type=device.get("mocTypeName", "Unknown"), deviceDn=device.get("dn")))
     return devices
 
+# Timeout (ligação, leitura) em segundos dos pedidos feitos sem timeout explícito
+HTTP_TIMEOUT = (5, 30)
+
+class _TimeoutHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter que aplica HTTP_TIMEOUT aos pedidos enviados sem timeout explícito"""
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = HTTP_TIMEOUT
+        return super().send(request, **kwargs)
+
+def _configure_http_session(session):
+    """
+    Monta um HTTPAdapter com pool maior na sessão do cliente (como no app.py), para que as
+    chamadas em paralelo reutilizem ligações keep-alive em vez de abrir uma ligação TLS nova.
+    Falhas de ligação, timeouts de leitura e respostas 502/503/504 são repetidas com backoff
+    exponencial; só depois disso é que safe_call regista o erro.
+    """
+    adapter = _TimeoutHTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=32,
+        # Os POST usados aqui são consultas só de leitura, por isso podem ser repetidos
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+
 # Aplicar monkey-patch
+# (com o nome do método que substitui, usado como chave em CACHE_TTL_BY_METHOD)
+custom_get_station_list.__name__ = "get_station_list"
 FusionSolarClient.get_station_list = custom_get_station_list
 FusionSolarClient.get_plant_stats_monthly = get_plant_stats_monthly
 FusionSolarClient.get_plant_stats_yearly = get_plant_stats_yearly
@@ -319,11 +417,86 @@ def load_accounts_from_env():
 OUTPUT_DIR = Path("test_results")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Número de contas em que se tenta o login ao mesmo tempo
+ACCOUNT_LOGIN_WORKERS = 3
+
+# Guardar em 02_plant_info a lista completa de estações da conta (só para depuração)
+DUMP_ALL_STATIONS = os.getenv("DUMP_ALL_STATIONS") == "1"
+
+# Número de chamadas à API feitas em simultâneo durante os testes de uma instalação
+TEST_CALL_WORKERS = max(1, int(os.getenv("ADEP_MAX_CONCURRENCY", "6")))
+
 # Path to the captcha model file
 CAPTCHA_MODEL_PATH = os.path.join("models", "captcha_huawei.onnx")
 
+# Cache em disco das respostas (opção --cache), útil ao repetir o script durante o
+# desenvolvimento. Só métodos que devolvem JSON simples (não objetos como PowerStatus),
+# com a validade em segundos de cada um.
+CACHE_DIR = OUTPUT_DIR / ".cache"
+CACHE_TTL_BY_METHOD = {
+    # Listas que raramente mudam
+    "get_station_list": 3600,
+    "get_plant_ids": 3600,
+    "get_device_ids_for_plant": 3600,
+    "get_battery_ids": 3600,
+    # Estatísticas agregadas
+    "get_plant_stats": 300,
+    "get_plant_stats_monthly": 600,
+    "get_plant_stats_yearly": 600,
+    "get_historical_data": 300,
+    # Dados em tempo real e alarmes
+    "get_current_plant_data": 30,
+    "get_plant_flow": 30,
+    "get_plant_alarm_data": 30,
+    "get_alarm_data": 30,
+    "get_battery_basic_stats": 30,
+    "get_battery_status": 30,
+    "get_battery_day_stats": 30,
+    "get_optimizer_stats": 30,
+    "get_real_time_data": 5,
+}
+_use_cache = False
+
+# Modo silencioso (--quiet): sem mensagens de progresso, só erros e o resumo final
+_quiet = False
+
+def _log(*args, **kwargs):
+    """print() das mensagens de progresso, omitido com --quiet"""
+    if not _quiet:
+        print(*args, **kwargs)
+
+# Arquivo .zip desta execução (opção --zip); None = um ficheiro JSON por resultado
+_results_archive = None
+# Ficheiro .jsonl desta execução (opção --jsonl): um resultado por linha
+_results_jsonl = None
+# Número de resultados guardados nesta execução (para o resumo final)
+_results_saved = 0
+
+def _json_default(obj):
+    """
+    Converte valores que o JSON não suporta: Decimal para float, objetos do cliente (p.ex.
+    PowerStatus) para o dicionário dos seus atributos e o resto para str.
+    (datetime, dataclasses e arrays NumPy já são tratados diretamente pelo orjson.)
+    """
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    return str(obj)
+
+def _encode_result(result: dict) -> bytes:
+    """Serializa um resultado em JSON UTF-8 indentado"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(result, default=_json_default,
+                            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(result, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
 def save_result(filename: str, data: dict, metadata: dict = None):
-    """Guarda um resultado num ficheiro JSON"""
+    """Guarda um resultado num ficheiro JSON (ou no .zip / .jsonl da execução, com --zip / --jsonl)"""
+    global _results_saved
+    _results_saved += 1
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     filepath = OUTPUT_DIR / f"{timestamp}_{filename}.json"
     
@@ -333,19 +506,125 @@ def save_result(filename: str, data: dict, metadata: dict = None):
         "data": data
     }
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(result, f, indent=2, ensure_ascii=False, default=str)
+    if _results_jsonl is not None:
+        record = {"name": filename, **result}
+        if ORJSON_AVAILABLE:
+            _results_jsonl.write(orjson.dumps(record, default=_json_default,
+                                              option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+        else:
+            _results_jsonl.write(json.dumps(record, ensure_ascii=False, default=_json_default).encode('utf-8'))
+        _results_jsonl.write(b"\n")
+        _log(f"  ✓ Guardado: {_results_jsonl.name} → {filename}")
+        return filepath
+    
+    if _results_archive is not None:
+        _results_archive.writestr(filepath.name, _encode_result(result))
+        _log(f"  ✓ Guardado: {_results_archive.filename} → {filepath.name}")
+        return filepath
     
-    print(f"  ✓ Guardado: {filepath}")
+    if ORJSON_AVAILABLE:
+        # orjson escreve UTF-8 sem escapar (equivalente a ensure_ascii=False)
+        with open(filepath, 'wb') as f:
+            f.write(_encode_result(result))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False, default=_json_default)
+    
+    _log(f"  ✓ Guardado: {filepath}")
     return filepath
 
+def login_and_get_stations(account: dict):
+    """
+    Faz login numa conta e obtém a sua lista de estações.
+    Devolve (client, erro de login ou None, resultado de safe_call da lista de estações).
+    """
+    client_kwargs = {"huawei_subdomain": account["subdomain"]}
+    if CAPTCHA_MODEL_PATH and os.path.exists(CAPTCHA_MODEL_PATH):
+        client_kwargs["captcha_model_path"] = CAPTCHA_MODEL_PATH
+    
+    try:
+        client = FusionSolarClient(account["user"], account["password"], **client_kwargs)
+        _configure_http_session(client._session)
+    except Exception as e:
+        return None, e, None
+    
+    return client, None, safe_call(client.get_station_list)
+
+def _cache_path(func, args, kwargs):
+    """Ficheiro da cache para esta chamada, ou None se o método não é guardado em cache"""
+    name = getattr(func, "__name__", "")
+    if name not in CACHE_TTL_BY_METHOD:
+        return None
+    # A conta faz parte da chave: o mesmo método pode ser chamado em várias contas
+    user = getattr(getattr(func, "__self__", None), "_user", None)
+    key = hashlib.sha1(repr((user, name, args, sorted(kwargs.items()))).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{name}_{key}.json"
+
 def safe_call(func, *args, **kwargs):
-    """Executa uma função de forma segura e retorna o resultado ou erro"""
+    """
+    Executa uma função de forma segura e retorna o resultado ou erro.
+    Com --cache, os resultados bem-sucedidos dos métodos em CACHE_TTL_BY_METHOD são
+    reutilizados de execuções anteriores enquanto não expirarem.
+    """
+    cache_file = _cache_path(func, args, kwargs) if _use_cache else None
+    if cache_file is not None:
+        try:
+            if time.time() - cache_file.stat().st_mtime < CACHE_TTL_BY_METHOD[func.__name__]:
+                cached = cache_file.read_bytes()
+                return orjson.loads(cached) if ORJSON_AVAILABLE else json.loads(cached)
+        except (OSError, ValueError):
+            pass  # Sem cache (ou ficheiro inválido): fazer o pedido
+    
     try:
         result = func(*args, **kwargs)
-        return {"success": True, "data": result}
     except Exception as e:
         return {"success": False, "error": str(e), "error_type": type(e).__name__}
+    
+    outcome = {"success": True, "data": result}
+    if cache_file is not None:
+        # Escrever num ficheiro temporário e renomear, para nunca ler um ficheiro a meio;
+        # se não for possível (pasta sem permissões, disco cheio) devolve-se o resultado sem cache
+        tmp_file = cache_file.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            tmp_file.write_bytes(_encode_result(outcome))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+    return outcome
+
+def _series_to_float(values):
+    """
+    Converte uma lista de valores da API para float64, com NaN onde não há valor
+    ("--" nas estatísticas, "-" nos sinais dos dispositivos, None ou inválido)
+    """
+    arr = np.array(values, dtype=object)
+    arr[(arr == "--") | (arr == "-") | (arr == None)] = np.nan  # noqa: E711 (comparação elemento a elemento)
+    try:
+        return arr.astype(np.float64)
+    except (ValueError, TypeError):
+        # Algum valor não numérico inesperado: converter um a um
+        def to_float(value):
+            try:
+                return float(value)
+            except (ValueError, TypeError):
+                return np.nan
+        return np.fromiter((to_float(v) for v in arr), dtype=np.float64, count=len(arr))
+
+def _iter_device_signals(device_realtime_data_list):
+    """Percorre os sinais (dicts com latestTime) dos resultados de get_real_time_data bem-sucedidos"""
+    for device_data in device_realtime_data_list or []:
+        if not device_data.get("success"):
+            continue
+        data = device_data.get("data")
+        items = data.get("data") if isinstance(data, dict) else None
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for signal in item.get("signals") or []:
+                if isinstance(signal, dict) and "latestTime" in signal:
+                    yield signal
 
 def find_last_valid_data_timestamp(client, plant_id, plant_stats_data, device_realtime_data_list, max_days_back=30):
     """
@@ -379,27 +658,20 @@ def find_last_valid_data_timestamp(client, plant_id, plant_stats_data, device_re
             if array_name in stats_data:
                 array = stats_data[array_name]
                 if isinstance(array, list) and len(array) == len(x_axis):
-                    # Procurar o último índice com valor válido (não "--")
-                    for i in range(len(array) - 1, -1, -1):
-                        value = array[i]
-                        if value != "--" and value is not None:
-                            try:
-                                # Tentar converter para float e verificar se é > 0 ou válido
-                                float_val = float(value)
-                                # Aceitar valores válidos (mesmo que sejam 0, desde que não seja "--")
-                                timestamp = x_axis[i] if i < len(x_axis) else None
-                                if timestamp:
-                                    found_timestamps.append({
-                                        "source": f"plant_stats.{array_name}",
-                                        "timestamp": timestamp,
-                                        "value": value,
-                                        "value_float": float_val,
-                                        "index": i,
-                                        "day_offset": day_offset
-                                    })
-                                    break  # Encontrou o último válido para este array
-                            except (ValueError, TypeError):
-                                pass
+                    # Procurar o último índice com valor válido (não "--"), mesmo que seja 0
+                    values = _series_to_float(array)
+                    for i in np.flatnonzero(~np.isnan(values))[::-1]:
+                        timestamp = x_axis[i]
+                        if timestamp:
+                            found_timestamps.append({
+                                "source": f"plant_stats.{array_name}",
+                                "timestamp": timestamp,
+                                "value": array[i],
+                                "value_float": float(values[i]),
+                                "index": int(i),
+                                "day_offset": day_offset
+                            })
+                            break  # Encontrou o último válido para este array
         return found_timestamps
     
     # 1. Verificar arrays de plant_stats do dia atual
@@ -418,79 +690,75 @@ def find_last_valid_data_timestamp(client, plant_id, plant_stats_data, device_re
                 break
     
     if not has_valid_data_today:
-        print(f"    ⏳ Nenhum dado válido encontrado hoje, a procurar retroativamente...")
-        for days_back in range(1, max_days_back + 1):
+        _log(f"    ⏳ Nenhum dado válido encontrado hoje, a procurar retroativamente...")
+        valid_by_day = {}  # days_back -> valores não-zero encontrados nesse dia (cache dos pedidos)
+        today = datetime.now().date()
+        
+        def valid_data_for_day(days_back):
+            """Obtém as estatísticas de há days_back dias e devolve os valores válidos não-zero"""
+            if days_back in valid_by_day:
+                return valid_by_day[days_back]
+            valid_found = []
             try:
-                # Calcular query_time para o dia (days_back dias atrás)
-                # Usar o mesmo método que _get_day_start_sec mas para o dia específico
-                target_date = datetime.now() - timedelta(days=days_back)
-                # Formatar como "YYYY-MM-DD 00:00:00" e converter para timestamp
-                target_date_str = target_date.strftime("%Y-%m-%d 00:00:00")
-                # Usar time.strptime e time.mktime como _get_day_start_sec faz
-                struct_time = time.strptime(target_date_str, "%Y-%m-%d %H:%M:%S")
-                # Converter para milissegundos (como _get_day_start_sec retorna)
-                query_time = round(time.mktime(struct_time) * 1000)
+                # query_time = 00:00:00 (hora local) do dia, em milissegundos como _get_day_start_sec
+                target_date = today - timedelta(days=days_back)
+                query_time = round(datetime(target_date.year, target_date.month, target_date.day).timestamp() * 1000)
                 
                 # Obter dados desse dia
                 result = safe_call(client.get_plant_stats, plant_id, query_time)
                 if result.get("success") and result.get("data"):
-                    stats_data = result["data"]
-                    found = check_plant_stats_for_valid_data(stats_data, day_offset=days_back)
-                    if found:
-                        # Filtrar apenas valores não-zero (dados reais)
-                        valid_found = [ts for ts in found if ts.get("value_float", 0) != 0]
-                        if valid_found:
-                            last_timestamps.extend(valid_found)
-                            print(f"    ✓ Encontrados dados válidos há {days_back} dia(s) - {valid_found[0].get('timestamp', 'N/A')}")
-                            break  # Encontrou dados válidos, parar busca
-                elif days_back % 7 == 0:  # Mostrar progresso a cada semana
-                    print(f"    ... Procurando há {days_back} dias...")
-            except Exception as e:
-                # Continuar para o próximo dia mesmo se houver erro
-                continue
+                    found = check_plant_stats_for_valid_data(result["data"], day_offset=days_back)
+                    # Filtrar apenas valores não-zero (dados reais)
+                    valid_found = [ts for ts in found if ts.get("value_float", 0) != 0]
+            except Exception:
+                pass
+            valid_by_day[days_back] = valid_found
+            return valid_found
+        
+        # Uma instalação sem dados desde há N dias também não os tem nos dias mais recentes,
+        # por isso basta procurar a fronteira: sondar 1, 2, 4, 8, ... dias em paralelo e depois
+        # fazer pesquisa binária entre a última sonda sem dados e a primeira com dados
+        probes = sorted({min(2 ** k, max_days_back) for k in range(max_days_back.bit_length() + 1)})
+        with ThreadPoolExecutor(max_workers=min(len(probes), TEST_CALL_WORKERS)) as executor:
+            list(executor.map(valid_data_for_day, probes))
+        
+        first_hit = next((i for i, days_back in enumerate(probes) if valid_by_day[days_back]), None)
+        if first_hit is not None:
+            low = probes[first_hit - 1] if first_hit > 0 else 0  # último dia conhecido sem dados
+            high = probes[first_hit]  # primeiro dia conhecido com dados
+            while high - low > 1:
+                mid = (low + high) // 2
+                if valid_data_for_day(mid):
+                    high = mid
+                else:
+                    low = mid
+            valid_found = valid_by_day[high]
+            last_timestamps.extend(valid_found)
+            _log(f"    ✓ Encontrados dados válidos há {high} dia(s) - {valid_found[0].get('timestamp', 'N/A')}")
     
     # 3. Verificar timestamps dos dispositivos (apenas se valor não for "-")
-    if device_realtime_data_list:
-        for device_data in device_realtime_data_list:
-            if not device_data.get("success"):
-                continue
-            
-            data = device_data.get("data", {})
-            if isinstance(data, dict):
-                signals = data.get("data", [])
-                if isinstance(signals, list):
-                    for item in signals:
-                        if isinstance(item, dict) and "signals" in item:
-                            for signal in item.get("signals", []):
-                                if isinstance(signal, dict) and "latestTime" in signal:
-                                    latest_time = signal.get("latestTime")
-                                    signal_value = signal.get("value", "-")
-                                    # Só considerar se o valor não for "-" ou se for um número válido
-                                    if latest_time and latest_time > 0:
-                                        # Verificar se o valor é válido (não "-")
-                                        is_valid = False
-                                        if signal_value != "-" and signal_value is not None:
-                                            try:
-                                                float(signal_value)
-                                                is_valid = True
-                                            except (ValueError, TypeError):
-                                                pass
-                                        
-                                        # Converter timestamp Unix para datetime
-                                        try:
-                                            dt = datetime.fromtimestamp(latest_time)
-                                            # Só adicionar se for válido OU se for o mais recente timestamp disponível
-                                            if is_valid:
-                                                last_timestamps.append({
-                                                    "source": f"device.{signal.get('name', 'unknown')}",
-                                                    "timestamp": dt.strftime("%Y-%m-%d %H:%M:%S"),
-                                                    "timestamp_unix": latest_time,
-                                                    "device_signal": signal.get("name"),
-                                                    "value": signal_value,
-                                                    "is_valid_value": True
-                                                })
-                                        except (ValueError, OSError):
-                                            pass
+    signals = [signal for signal in _iter_device_signals(device_realtime_data_list)
+               if signal.get("latestTime") and signal["latestTime"] > 0]
+    # Validar todos os valores de uma vez: NaN = sem valor numérico
+    signal_values = _series_to_float([signal.get("value", "-") for signal in signals])
+    for signal, numeric_value in zip(signals, signal_values):
+        if np.isnan(numeric_value):
+            continue
+        latest_time = signal["latestTime"]
+        signal_value = signal.get("value", "-")
+        try:
+            # Converter timestamp Unix para datetime
+            dt = datetime.fromtimestamp(latest_time)
+        except (ValueError, OSError, OverflowError):
+            continue
+        last_timestamps.append({
+            "source": f"device.{signal.get('name', 'unknown')}",
+            "timestamp": dt.strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp_unix": latest_time,
+            "device_signal": signal.get("name"),
+            "value": signal_value,
+            "is_valid_value": True
+        })
     
     # Encontrar o mais recente
     if not last_timestamps:
@@ -500,21 +768,18 @@ def find_last_valid_data_timestamp(client, plant_id, plant_stats_data, device_re
         }
     
     # Ordenar por timestamp (mais recente primeiro)
-    # Para timestamps Unix, usar timestamp_unix se disponível
+    # Todos os timestamps são "YYYY-MM-DD HH:MM" ou "YYYY-MM-DD HH:MM:SS" com zeros à esquerda
+    # (os dos dispositivos já foram formatados assim a partir de latestTime), por isso depois de
+    # normalizados para 19 caracteres a ordem alfabética é a ordem cronológica
     def get_sort_key(item):
-        if "timestamp_unix" in item:
-            return item["timestamp_unix"]
-        # Tentar parsear timestamp string
-        try:
-            # Pode ser "YYYY-MM-DD HH:MM" ou "YYYY-MM-DD HH:MM:SS"
-            timestamp_str = item["timestamp"]
-            if len(timestamp_str) == 16:  # "YYYY-MM-DD HH:MM"
-                dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M")
-            else:  # "YYYY-MM-DD HH:MM:SS"
-                dt = datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-            return dt.timestamp()
-        except:
-            return 0
+        timestamp_str = item.get("timestamp")
+        if not isinstance(timestamp_str, str):
+            return ""
+        if len(timestamp_str) == 16:  # "YYYY-MM-DD HH:MM"
+            return timestamp_str + ":00"
+        if len(timestamp_str) == 19:  # "YYYY-MM-DD HH:MM:SS"
+            return timestamp_str
+        return ""  # Formato desconhecido: fica no fim
     
     last_timestamps.sort(key=get_sort_key, reverse=True)
     most_recent = last_timestamps[0]
@@ -539,23 +804,74 @@ def main():
         nargs='?',  # Argumento opcional
         help='Nome da instalação a testar (obrigatório: defina por argumento ou pela variável de ambiente PLANT_NAME)'
     )
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Não mostrar o progresso de cada chamada (só erros e o resumo final)'
+    )
+    parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reutilizar respostas recentes guardadas em test_results/.cache (para repetir o script rapidamente)'
+    )
+    output_mode = parser.add_mutually_exclusive_group()
+    output_mode.add_argument(
+        '--zip',
+        action='store_true',
+        help='Guardar todos os resultados num único arquivo .zip em vez de um ficheiro JSON por chamada'
+    )
+    output_mode.add_argument(
+        '--jsonl',
+        action='store_true',
+        help='Guardar todos os resultados num único ficheiro .jsonl (um resultado por linha)'
+    )
     
     args = parser.parse_args()
-    plant_name = args.plant_name
     
-    print("="*60)
-    print(f"SCRIPT DE TESTES - {plant_name}")
-    print("="*60)
-    print()
+    global _results_archive, _results_jsonl, _quiet, _use_cache
+    _quiet = args.quiet
+    _use_cache = args.cache
+    if _use_cache:
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+        except OSError as e:
+            print(f"⚠️  Não foi possível criar {CACHE_DIR} ({e}), a continuar sem cache")
+            _use_cache = False
+    if args.zip:
+        archive_path = OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_resultados.zip"
+        _results_archive = zipfile.ZipFile(archive_path, "w", zipfile.ZIP_DEFLATED, compresslevel=1)
+    elif args.jsonl:
+        jsonl_path = OUTPUT_DIR / f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_resultados.jsonl"
+        _results_jsonl = open(jsonl_path, "wb", buffering=1 << 20)
+    try:
+        run_tests(args.plant_name)
+    finally:
+        if _results_archive is not None:
+            _results_archive.close()
+            _results_archive = None
+        if _results_jsonl is not None:
+            _results_jsonl.close()
+            _results_jsonl = None
+
+# Dispositivo devolvido por get_device_ids_for_plant: tipo e deviceDn
+Device = namedtuple("Device", "type dn")
+
+
+def run_tests(plant_name):
+    """Executa todas as chamadas à API para a instalação plant_name e guarda os resultados"""
+    _log("="*60)
+    _log(f"SCRIPT DE TESTES - {plant_name}")
+    _log("="*60)
+    _log()
     
     # Carregar contas do .env
     accounts = load_accounts_from_env()
-    print(f"📋 Encontradas {len(accounts)} conta(s) configurada(s)")
+    _log(f"📋 Encontradas {len(accounts)} conta(s) configurada(s)")
     if DOTENV_AVAILABLE:
-        print("   (Carregadas do ficheiro .env)")
+        _log("   (Carregadas do ficheiro .env)")
     else:
-        print("   (Usando valores padrão - instale python-dotenv para usar .env)")
-    print()
+        _log("   (Usando valores padrão - instale python-dotenv para usar .env)")
+    _log()
     
     # Tentar cada conta até encontrar a instalação
     plant = None
@@ -563,76 +879,87 @@ def main():
     used_account = None
     all_stations_by_account = {}  # Guardar todas as estações de todas as contas
     
-    for account in accounts:
+    # Login e lista de estações de várias contas em paralelo; os resultados são tratados pela
+    # ordem das contas e as tentativas que ainda não começaram são canceladas quando se encontra
+    # a instalação (as que já começaram terminam e as sessões são fechadas logo a seguir).
+    # Poucas em simultâneo para não disparar o limite de logins da Huawei.
+    login_executor = ThreadPoolExecutor(max_workers=max(1, min(ACCOUNT_LOGIN_WORKERS, len(accounts))))
+    attempts = [login_executor.submit(login_and_get_stations, account) for account in accounts]
+    
+    for account, attempt in zip(accounts, attempts):
         account_name = account["name"]
-        print(f"🔑 A tentar fazer login na {account_name} ({account['user']})...")
-        
-        client_kwargs = {"huawei_subdomain": account["subdomain"]}
-        if CAPTCHA_MODEL_PATH and os.path.exists(CAPTCHA_MODEL_PATH):
-            client_kwargs["captcha_model_path"] = CAPTCHA_MODEL_PATH
+        _log(f"🔑 A tentar fazer login na {account_name} ({account['user']})...")
         
-        try:
-            client = FusionSolarClient(account["user"], account["password"], **client_kwargs)
-            print(f"  ✓ Login bem-sucedido na {account_name}!")
-        except Exception as e:
-            print(f"  ❌ Erro no login na {account_name}: {e}")
-            print(f"  ⏭️  A tentar próxima conta...")
-            print()
+        client, login_error, result = attempt.result()
+        if login_error is not None:
+            print(f"  ❌ Erro no login na {account_name}: {login_error}")
+            _log(f"  ⏭️  A tentar próxima conta...")
+            _log()
             continue
+        _log(f"  ✓ Login bem-sucedido na {account_name}!")
         
-        # Obter lista de estações desta conta
-        print(f"  📋 A obter lista de estações da {account_name}...")
-        result = safe_call(client.get_station_list)
+        # Lista de estações desta conta (já obtida logo a seguir ao login)
+        _log(f"  📋 A obter lista de estações da {account_name}...")
         
         if not result["success"] or not result.get("data"):
             print(f"  ❌ Não foi possível obter a lista de estações da {account_name}")
-            print(f"  ⏭️  A tentar próxima conta...")
-            print()
+            _log(f"  ⏭️  A tentar próxima conta...")
+            _log()
             continue
         
         stations = result["data"]
-        print(f"  ✓ Encontradas {len(stations)} estações na {account_name}")
+        _log(f"  ✓ Encontradas {len(stations)} estações na {account_name}")
         
         # Guardar estações desta conta para mostrar depois se necessário
         all_stations_by_account[account_name] = stations
         
-        # Procurar a instalação específica
-        for station in stations:
-            if station.get("name") == plant_name:
-                plant = station
-                used_account = account
-                break
+        # Procurar a instalação específica (reversed: com nomes repetidos fica a primeira)
+        stations_by_name = {station.get("name"): station for station in reversed(stations)}
+        plant = stations_by_name.get(plant_name)
         
         if plant:
-            print(f"  ✓ Instalação '{plant_name}' encontrada na {account_name}!")
+            used_account = account
+            _log(f"  ✓ Instalação '{plant_name}' encontrada na {account_name}!")
             break
         else:
-            print(f"  ⚠️  Instalação '{plant_name}' não encontrada na {account_name}")
-            print(f"  ⏭️  A tentar próxima conta...")
-            print()
+            _log(f"  ⚠️  Instalação '{plant_name}' não encontrada na {account_name}")
+            _log(f"  ⏭️  A tentar próxima conta...")
+            _log()
+    
+    login_executor.shutdown(wait=True, cancel_futures=True)
+    # Fechar as sessões das contas que não vão ser usadas
+    for attempt in attempts:
+        if attempt.cancelled():
+            continue
+        other_client = attempt.result()[0]
+        if other_client is not None and not (plant and other_client is client):
+            try:
+                other_client.log_out()
+            except Exception:
+                pass
     
     # Verificar se encontrou a instalação
     if not plant:
         print(f"  ❌ Instalação '{plant_name}' não encontrada em nenhuma das contas!")
-        print()
-        print("  📋 Estações disponíveis em todas as contas:")
-        print()
+        _log()
+        _log("  📋 Estações disponíveis em todas as contas:")
+        _log()
         
         # Mostrar estações de todas as contas
         total_stations = 0
         for account_name, stations in all_stations_by_account.items():
             if stations:
-                print(f"  {account_name} ({len(stations)} estação(ões)):")
+                _log(f"  {account_name} ({len(stations)} estação(ões)):")
                 for station in stations:
                     station_name = station.get('name', 'N/A')
-                    print(f"    - {station_name}")
+                    _log(f"    - {station_name}")
                     total_stations += 1
-                print()
+                _log()
         
         if total_stations == 0:
-            print("    ⚠️  Nenhuma estação encontrada em nenhuma conta.")
+            _log("    ⚠️  Nenhuma estação encontrada em nenhuma conta.")
         else:
-            print(f"  Total: {total_stations} estação(ões) em {len(all_stations_by_account)} conta(s)")
+            _log(f"  Total: {total_stations} estação(ões) em {len(all_stations_by_account)} conta(s)")
         return
     
     if not client:
@@ -640,369 +967,410 @@ def main():
         return
     
     plant_id = plant.get("dn")
-    print()
-    print(f"  ✓ Instalação encontrada: {plant_name}")
-    print(f"     Conta utilizada: {used_account['name']}")
+    _log()
+    _log(f"  ✓ Instalação encontrada: {plant_name}")
+    _log(f"     Conta utilizada: {used_account['name']}")
     
     plant_id = plant.get("dn")
-    print(f"  ✓ Instalação encontrada: {plant_name}")
-    print(f"     ID: {plant_id}")
-    print(f"     Status: {plant.get('plantStatus', 'N/A')}")
-    print(f"     Capacidade instalada: {plant.get('installedCapacity', 'N/A')} kW")
-    print()
-    
-    # Guardar dados completos da estação
-    save_result("02_plant_info", {
-        "plant": plant,
-        "all_stations": stations
-    }, {
-        "method": "get_station_list (filtered)",
-        "description": "Informação completa da instalação e todas as estações"
-    })
-    
-    # 2. Status geral de potência
-    print("2️⃣  A obter status geral de potência...")
-    result = safe_call(client.get_power_status)
-    save_result("03_power_status", result, {
-        "method": "get_power_status",
-        "description": "Status geral de potência de todas as estações"
-    })
-    if result["success"]:
-        ps = result["data"]
-        print(f"  ✓ Potência atual: {ps.current_power_kw} kW")
-        print(f"     Energia hoje: {ps.energy_today_kwh} kWh")
-        print(f"     Energia total: {ps.energy_kwh} kWh")
-    print()
-    
-    # 3. Dados atuais da planta
-    print("3️⃣  A obter dados atuais da planta...")
-    result = safe_call(client.get_current_plant_data, plant_id)
-    save_result("04_current_plant_data", result, {
-        "method": "get_current_plant_data",
-        "plant_id": plant_id,
-        "description": "Dados em tempo real da instalação"
-    })
-    if result["success"]:
-        print(f"  ✓ Dados obtidos com sucesso")
-        # Mostrar algumas chaves importantes
-        data = result["data"]
-        if isinstance(data, dict):
-            print(f"     Chaves disponíveis: {', '.join(list(data.keys())[:10])}")
-    print()
-    
-    # 4. Estatísticas do dia
-    print("4️⃣  A obter estatísticas do dia...")
-    result = safe_call(client.get_plant_stats, plant_id)
-    save_result("05_plant_stats_daily", result, {
-        "method": "get_plant_stats",
-        "plant_id": plant_id,
-        "time_dim": 2,
-        "description": "Estatísticas do dia (intervalos de 5 minutos)"
-    })
-    plant_stats_data = None
-    if result["success"]:
-        plant_stats_data = result["data"]
-        if isinstance(plant_stats_data, dict):
-            print(f"  ✓ Estatísticas obtidas")
-            print(f"     Chaves disponíveis: {', '.join(list(plant_stats_data.keys())[:10])}")
-            # Mostrar tamanho dos arrays
-            for key in ["productPower", "usePower", "selfUsePower"]:
-                if key in plant_stats_data and isinstance(plant_stats_data[key], list):
-                    print(f"     {key}: {len(plant_stats_data[key])} valores")
-    print()
-    
-    # 4b. Últimos dados com timestamps (atualizações recentes)
-    if plant_stats_data:
-        print("4️⃣b A obter últimos dados com timestamps (atualizações recentes)...")
-        result = safe_call(client.get_last_plant_data, plant_stats_data)
-        save_result("05b_last_plant_data", result, {
-            "method": "get_last_plant_data",
+    _log(f"  ✓ Instalação encontrada: {plant_name}")
+    _log(f"     ID: {plant_id}")
+    _log(f"     Status: {plant.get('plantStatus', 'N/A')}")
+    _log(f"     Capacidade instalada: {plant.get('installedCapacity', 'N/A')} kW")
+    _log()
+    
+    # As chamadas das secções 2-9, 11 e 12 não dependem umas das outras: lançá-las todas já
+    # em paralelo e ir buscar cada resultado (pela ordem habitual) na respetiva secção
+    # Início do dia calculado uma vez e usado em todas as estatísticas desta execução
+    day_start = client._get_day_start_sec()
+    executor = ThreadPoolExecutor(max_workers=TEST_CALL_WORKERS)
+    try:
+        pending = {
+            "power_status": executor.submit(safe_call, client.get_power_status),
+            "current_plant_data": executor.submit(safe_call, client.get_current_plant_data, plant_id),
+            "plant_stats": executor.submit(safe_call, client.get_plant_stats, plant_id, day_start),
+            "plant_stats_monthly": executor.submit(safe_call, client.get_plant_stats_monthly, plant_id, day_start),
+            "plant_stats_yearly": executor.submit(safe_call, client.get_plant_stats_yearly, plant_id, day_start),
+            "plant_flow": executor.submit(safe_call, client.get_plant_flow, plant_id),
+            "device_ids": executor.submit(safe_call, client.get_device_ids_for_plant, plant_id),
+            "plant_ids": executor.submit(safe_call, client.get_plant_ids),
+            "plant_alarm_data": executor.submit(safe_call, client.get_plant_alarm_data, plant_id),
+            "battery_ids": executor.submit(safe_call, client.get_battery_ids, plant_id),
+        }
+        
+        # Guardar dados completos da estação (das restantes estações só os nomes, a não ser
+        # que DUMP_ALL_STATIONS=1 peça a lista completa)
+        plant_info = {
+            "plant": plant,
+            "station_count": len(stations),
+            "station_names": [s.get("name") for s in stations]
+        }
+        if DUMP_ALL_STATIONS:
+            plant_info["all_stations"] = stations
+        save_result("02_plant_info", plant_info, {
+            "method": "get_station_list (filtered)",
+            "description": "Informação completa da instalação e nomes de todas as estações"
+        })
+        
+        # 2. Status geral de potência
+        _log("2️⃣  A obter status geral de potência...")
+        result = pending["power_status"].result()
+        save_result("03_power_status", result, {
+            "method": "get_power_status",
+            "description": "Status geral de potência de todas as estações"
+        })
+        if result["success"]:
+            ps = result["data"]
+            _log(f"  ✓ Potência atual: {ps.current_power_kw} kW")
+            _log(f"     Energia hoje: {ps.energy_today_kwh} kWh")
+            _log(f"     Energia total: {ps.energy_kwh} kWh")
+        _log()
+        
+        # 3. Dados atuais da planta
+        _log("3️⃣  A obter dados atuais da planta...")
+        result = pending["current_plant_data"].result()
+        save_result("04_current_plant_data", result, {
+            "method": "get_current_plant_data",
             "plant_id": plant_id,
-            "description": f"Últimos dados com timestamps da instalação {plant_name} - mostra quando foi a última atualização de cada métrica"
+            "description": "Dados em tempo real da instalação"
         })
         if result["success"]:
-            last_data = result["data"]
-            if isinstance(last_data, dict):
-                print(f"  ✓ Últimos dados extraídos")
-                # Mostrar alguns timestamps importantes
-                for key in ["productPower", "usePower", "meterActivePower"]:
-                    if key in last_data and isinstance(last_data[key], dict):
-                        timestamp = last_data[key].get("time", "N/A")
-                        value = last_data[key].get("value", "N/A")
-                        print(f"     {key}: {value} (última atualização: {timestamp})")
-        print()
-    
-    # 5. Estatísticas mensais
-    print("5️⃣  A obter estatísticas mensais...")
-    result = safe_call(client.get_plant_stats_monthly, plant_id)
-    save_result("06_plant_stats_monthly", result, {
-        "method": "get_plant_stats_monthly",
-        "plant_id": plant_id,
-        "time_dim": 5,
-        "description": "Estatísticas mensais"
-    })
-    if result["success"]:
-        data = result["data"]
-        if isinstance(data, dict):
-            print(f"  ✓ Estatísticas mensais obtidas")
-            print(f"     Chaves disponíveis: {', '.join(list(data.keys())[:10])}")
-    print()
-    
-    # 6. Estatísticas anuais
-    print("6️⃣  A obter estatísticas anuais...")
-    result = safe_call(client.get_plant_stats_yearly, plant_id)
-    save_result("07_plant_stats_yearly", result, {
-        "method": "get_plant_stats_yearly",
-        "plant_id": plant_id,
-        "time_dim": 6,
-        "description": "Estatísticas anuais"
-    })
-    if result["success"]:
-        data = result["data"]
-        if isinstance(data, dict):
-            print(f"  ✓ Estatísticas anuais obtidas")
-            print(f"     Chaves disponíveis: {', '.join(list(data.keys())[:10])}")
-    print()
-    
-    # 7. Fluxo da planta
-    print("7️⃣  A obter fluxo da planta...")
-    result = safe_call(client.get_plant_flow, plant_id)
-    save_result("08_plant_flow", result, {
-        "method": "get_plant_flow",
-        "plant_id": plant_id,
-        "description": "Fluxo de energia da planta (retorna flow_data completo)"
-    })
-    if result["success"]:
-        data = result["data"]
-        if isinstance(data, dict):
-            print(f"  ✓ Fluxo obtido")
-            # get_plant_flow retorna o objeto completo, não só data
-            if "data" in data:
-                print(f"     Chaves em data: {', '.join(list(data['data'].keys())[:10])}")
-            print(f"     Chaves principais: {', '.join(list(data.keys())[:10])}")
-    print()
-    
-    # 8. IDs dos dispositivos da instalação específica
-    print("8️⃣  A obter IDs dos dispositivos da instalação...")
-    result = safe_call(client.get_device_ids_for_plant, plant_id)
-    save_result("09_device_ids", result, {
-        "method": "get_device_ids_for_plant",
-        "plant_id": plant_id,
-        "description": f"Lista de IDs dos dispositivos da instalação {plant_name} (retorna lista de dicts com type e deviceDn)"
-    })
-    device_ids = []
-    device_list = []
-    if result["success"]:
-        device_list = result["data"] or []
-        # get_device_ids_for_plant retorna lista de dicts: [{"type": "...", "deviceDn": "..."}]
-        if device_list and isinstance(device_list[0], dict):
-            device_ids = [d.get("deviceDn") for d in device_list if d.get("deviceDn")]
-        else:
-            device_ids = device_list if device_list else []
-        print(f"  ✓ Encontrados {len(device_list)} dispositivos na instalação {plant_name}")
-        if device_list:
-            for i, device in enumerate(device_list[:10], 1):  # Mostrar até 10
-                if isinstance(device, dict):
-                    print(f"     {i}. {device.get('type', 'N/A')}: {device.get('deviceDn', 'N/A')}")
-                else:
-                    print(f"     {i}. {device}")
-    else:
-        print(f"  ⚠️  Erro ao obter dispositivos: {result.get('error', 'Unknown error')}")
-    print()
-    
-    # 9. IDs das plantas
-    print("9️⃣  A obter IDs das plantas...")
-    result = safe_call(client.get_plant_ids)
-    save_result("10_plant_ids", result, {
-        "method": "get_plant_ids",
-        "description": "Lista de IDs de todas as plantas"
-    })
-    if result["success"]:
-        plant_ids = result["data"]
-        print(f"  ✓ Encontradas {len(plant_ids)} plantas")
-    print()
-    
-    # 10. Dados em tempo real dos dispositivos
-    device_realtime_results = []
-    if device_ids:
-        print("🔟 A obter dados em tempo real dos dispositivos...")
-        for i, device_id in enumerate(device_ids[:3], 1):  # Limitar a 3 para não ser demasiado
-            device_info = device_list[i-1] if (device_list and i-1 < len(device_list)) else {}
-            device_type = device_info.get('type', 'N/A') if isinstance(device_info, dict) else 'N/A'
-            print(f"    Dispositivo {i}/{min(3, len(device_ids))}: {device_type} ({device_id})")
-            result = safe_call(client.get_real_time_data, device_id)
-            device_realtime_results.append(result)
-            save_result(f"11_realtime_data_device_{i}", result, {
-                "method": "get_real_time_data",
-                "device_id": device_id,
-                "device_type": device_type,
-                "description": f"Dados em tempo real do dispositivo {device_type} ({device_id})"
-            })
-        print()
-    
-    # 10b. Análise: Última vez que houve dados válidos (procura retroativamente)
-    # Nota: plant_stats_data foi definido na secção 4
-    print("🔟b A analisar última vez que houve dados válidos (procurando retroativamente)...")
-    # Usar plant_stats_data da secção 4 (definido acima)
-    # Procurar até 30 dias atrás se necessário
-    last_valid_analysis = find_last_valid_data_timestamp(
-        client, 
-        plant_id, 
-        plant_stats_data, 
-        device_realtime_results,
-        max_days_back=30
-    )
-    save_result("11b_last_valid_data_analysis", last_valid_analysis, {
-        "method": "find_last_valid_data_timestamp",
-        "plant_id": plant_id,
-        "description": "Análise para encontrar o timestamp da última vez que houve dados válidos"
-    })
-    if last_valid_analysis.get("found"):
-        most_recent = last_valid_analysis["most_recent"]
-        print(f"  ✓ Último dado válido encontrado:")
-        print(f"     Fonte: {most_recent.get('source', 'N/A')}")
-        print(f"     Timestamp: {most_recent.get('timestamp', 'N/A')}")
-        if 'value' in most_recent:
-            print(f"     Valor: {most_recent.get('value', 'N/A')}")
-        print(f"     Total de timestamps encontrados: {last_valid_analysis.get('total_found', 0)}")
-    else:
-        print(f"  ⚠️  {last_valid_analysis.get('message', 'Nenhum dado válido encontrado')}")
-    print()
-    
-    # 11. Dados de alarmes da instalação
-    print("1️⃣1️⃣  A obter dados de alarmes da instalação...")
-    result = safe_call(client.get_plant_alarm_data, plant_id)
-    save_result("12_plant_alarm_data", result, {
-        "method": "get_plant_alarm_data",
-        "plant_id": plant_id,
-        "description": f"Dados de alarmes da instalação {plant_name}"
-    })
-    if result["success"]:
-        data = result["data"]
-        if isinstance(data, dict):
-            total_count = data.get("data", {}).get("totalCount", 0)
-            print(f"  ✓ Encontrados {total_count} alertas na instalação")
-    print()
-    
-    # 11b. Dados de alarmes por dispositivo (se disponível)
-    if device_ids:
-        print("1️⃣1️⃣b A obter dados de alarmes por dispositivo...")
-        for i, device_id in enumerate(device_ids[:3], 1):  # Limitar a 3
-            device_info = device_list[i-1] if (device_list and i-1 < len(device_list)) else {}
-            device_type = device_info.get('type', 'N/A') if isinstance(device_info, dict) else 'N/A'
-            print(f"    Dispositivo {i}/{min(3, len(device_ids))}: {device_type} ({device_id})")
-            result = safe_call(client.get_alarm_data, device_id)
-            save_result(f"12b_alarm_data_device_{i}", result, {
-                "method": "get_alarm_data",
-                "device_id": device_id,
-                "device_type": device_type,
+            _log(f"  ✓ Dados obtidos com sucesso")
+            # Mostrar algumas chaves importantes
+            data = result["data"]
+            if isinstance(data, dict):
+                _log(f"     Chaves disponíveis: {', '.join(itertools.islice(data, 10))}")
+        _log()
+        
+        # 4. Estatísticas do dia
+        _log("4️⃣  A obter estatísticas do dia...")
+        result = pending["plant_stats"].result()
+        save_result("05_plant_stats_daily", result, {
+            "method": "get_plant_stats",
+            "plant_id": plant_id,
+            "time_dim": 2,
+            "description": "Estatísticas do dia (intervalos de 5 minutos)"
+        })
+        plant_stats_data = None
+        if result["success"]:
+            plant_stats_data = result["data"]
+            if isinstance(plant_stats_data, dict):
+                _log(f"  ✓ Estatísticas obtidas")
+                _log(f"     Chaves disponíveis: {', '.join(itertools.islice(plant_stats_data, 10))}")
+                # Mostrar tamanho dos arrays
+                for key in ["productPower", "usePower", "selfUsePower"]:
+                    if key in plant_stats_data and isinstance(plant_stats_data[key], list):
+                        _log(f"     {key}: {len(plant_stats_data[key])} valores")
+        _log()
+        
+        # 4b. Últimos dados com timestamps (atualizações recentes)
+        if plant_stats_data:
+            _log("4️⃣b A obter últimos dados com timestamps (atualizações recentes)...")
+            result = safe_call(client.get_last_plant_data, plant_stats_data)
+            save_result("05b_last_plant_data", result, {
+                "method": "get_last_plant_data",
                 "plant_id": plant_id,
-                "description": f"Dados de alarmes do dispositivo {device_type} ({device_id}) da instalação {plant_name}"
-            })
-        print()
-    
-    # 12. IDs de baterias
-    print("1️⃣2️⃣  A obter IDs de baterias...")
-    result = safe_call(client.get_battery_ids, plant_id)
-    save_result("13_battery_ids", result, {
-        "method": "get_battery_ids",
-        "plant_id": plant_id,
-        "description": "Lista de IDs de baterias da instalação"
-    })
-    battery_ids = []
-    if result["success"]:
-        battery_ids = result["data"]
-        print(f"  ✓ Encontradas {len(battery_ids)} baterias")
-    print()
-    
-    # 13. Status das baterias
-    if battery_ids:
-        print("1️⃣3️⃣  A obter status das baterias...")
-        for i, battery_id in enumerate(battery_ids, 1):
-            print(f"    Bateria {i}/{len(battery_ids)}: {battery_id}")
-            
-            # Status básico
-            result = safe_call(client.get_battery_basic_stats, battery_id)
-            save_result(f"14_battery_basic_{i}", result, {
-                "method": "get_battery_basic_stats",
-                "battery_id": battery_id,
-                "description": f"Status básico da bateria {battery_id}"
+                "description": f"Últimos dados com timestamps da instalação {plant_name} - mostra quando foi a última atualização de cada métrica"
             })
-            
-            # Status completo
-            result = safe_call(client.get_battery_status, battery_id)
-            save_result(f"15_battery_status_{i}", result, {
-                "method": "get_battery_status",
-                "battery_id": battery_id,
-                "description": f"Status completo da bateria {battery_id}"
-            })
-            
-            # Estatísticas do dia
-            result = safe_call(client.get_battery_day_stats, battery_id)
-            save_result(f"16_battery_day_stats_{i}", result, {
-                "method": "get_battery_day_stats",
-                "battery_id": battery_id,
-                "description": f"Estatísticas do dia da bateria {battery_id}"
-            })
-        print()
-    
-    # 14. Dados históricos (se device_ids disponível)
-    if device_ids:
-        print("1️⃣4️⃣  A obter dados históricos...")
-        device_dn = device_ids[0] if device_ids else None
-        result = safe_call(client.get_historical_data, 
-                          signal_ids=['30014', '30016', '30017'], 
-                          device_dn=device_dn)
-        save_result("17_historical_data", result, {
-            "method": "get_historical_data",
-            "device_dn": device_dn,
-            "signal_ids": ['30014', '30016', '30017'],
-            "description": "Dados históricos do dispositivo"
+            if result["success"]:
+                last_data = result["data"]
+                if isinstance(last_data, dict):
+                    _log(f"  ✓ Últimos dados extraídos")
+                    # Mostrar alguns timestamps importantes
+                    for key in ["productPower", "usePower", "meterActivePower"]:
+                        if key in last_data and isinstance(last_data[key], dict):
+                            timestamp = last_data[key].get("time", "N/A")
+                            value = last_data[key].get("value", "N/A")
+                            _log(f"     {key}: {value} (última atualização: {timestamp})")
+            _log()
+        
+        # 5. Estatísticas mensais
+        _log("5️⃣  A obter estatísticas mensais...")
+        result = pending["plant_stats_monthly"].result()
+        save_result("06_plant_stats_monthly", result, {
+            "method": "get_plant_stats_monthly",
+            "plant_id": plant_id,
+            "time_dim": 5,
+            "description": "Estatísticas mensais"
         })
         if result["success"]:
-            print(f"  ✓ Dados históricos obtidos")
-        print()
-    
-    # 15. Estatísticas de otimizadores (se disponível)
-    print("1️⃣5️⃣  A obter estatísticas de otimizadores...")
-    # get_optimizer_stats precisa de inverter_id, não plant_id
-    # Tentar com device_ids se disponível
-    if device_ids:
-        for i, device_id in enumerate(device_ids[:2], 1):  # Limitar a 2
-            print(f"    Dispositivo {i}/{min(2, len(device_ids))}: {device_id}")
-            result = safe_call(client.get_optimizer_stats, device_id)
-            save_result(f"18_optimizer_stats_device_{i}", result, {
-                "method": "get_optimizer_stats",
-                "inverter_id": device_id,
-                "description": f"Estatísticas dos otimizadores do dispositivo {device_id}"
+            data = result["data"]
+            if isinstance(data, dict):
+                _log(f"  ✓ Estatísticas mensais obtidas")
+                _log(f"     Chaves disponíveis: {', '.join(itertools.islice(data, 10))}")
+        _log()
+        
+        # 6. Estatísticas anuais
+        _log("6️⃣  A obter estatísticas anuais...")
+        result = pending["plant_stats_yearly"].result()
+        save_result("07_plant_stats_yearly", result, {
+            "method": "get_plant_stats_yearly",
+            "plant_id": plant_id,
+            "time_dim": 6,
+            "description": "Estatísticas anuais"
+        })
+        if result["success"]:
+            data = result["data"]
+            if isinstance(data, dict):
+                _log(f"  ✓ Estatísticas anuais obtidas")
+                _log(f"     Chaves disponíveis: {', '.join(itertools.islice(data, 10))}")
+        _log()
+        
+        # 7. Fluxo da planta
+        _log("7️⃣  A obter fluxo da planta...")
+        result = pending["plant_flow"].result()
+        save_result("08_plant_flow", result, {
+            "method": "get_plant_flow",
+            "plant_id": plant_id,
+            "description": "Fluxo de energia da planta (retorna flow_data completo)"
+        })
+        if result["success"]:
+            data = result["data"]
+            if isinstance(data, dict):
+                _log(f"  ✓ Fluxo obtido")
+                # get_plant_flow retorna o objeto completo, não só data
+                if "data" in data:
+                    _log(f"     Chaves em data: {', '.join(itertools.islice(data['data'], 10))}")
+                _log(f"     Chaves principais: {', '.join(itertools.islice(data, 10))}")
+        _log()
+        
+        # 8. IDs dos dispositivos da instalação específica
+        _log("8️⃣  A obter IDs dos dispositivos da instalação...")
+        result = pending["device_ids"].result()
+        save_result("09_device_ids", result, {
+            "method": "get_device_ids_for_plant",
+            "plant_id": plant_id,
+            "description": f"Lista de IDs dos dispositivos da instalação {plant_name} (retorna lista de dicts com type e deviceDn)"
+        })
+        devices = []  # Dispositivos com deviceDn, pela ordem da API
+        if result["success"]:
+            device_list = result["data"] or []
+            # get_device_ids_for_plant retorna lista de dicts: [{"type": "...", "deviceDn": "..."}]
+            if device_list and isinstance(device_list[0], dict):
+                devices = [Device(d.get("type", "N/A"), d["deviceDn"]) for d in device_list if d.get("deviceDn")]
+            else:
+                devices = [Device("N/A", d) for d in device_list]
+            _log(f"  ✓ Encontrados {len(device_list)} dispositivos na instalação {plant_name}")
+            for i, device in enumerate(devices[:10], 1):  # Mostrar até 10
+                _log(f"     {i}. {device.type}: {device.dn}")
+        else:
+            _log(f"  ⚠️  Erro ao obter dispositivos: {result.get('error', 'Unknown error')}")
+        _log()
+        device_ids = [device.dn for device in devices]
+        
+        # Pedidos por dispositivo das secções 10 e 11b (tempo real e alarmes) lançados todos juntos
+        # logo que se conhecem os dispositivos; cada secção trata depois os seus pela ordem
+        sampled_devices = devices[:3]  # Limitar a 3 para não ser demasiado
+        realtime_pending = [executor.submit(safe_call, client.get_real_time_data, device.dn)
+                            for device in sampled_devices]
+        alarm_pending = [executor.submit(safe_call, client.get_alarm_data, device.dn)
+                         for device in sampled_devices]
+        
+        # 9. IDs das plantas
+        _log("9️⃣  A obter IDs das plantas...")
+        result = pending["plant_ids"].result()
+        save_result("10_plant_ids", result, {
+            "method": "get_plant_ids",
+            "description": "Lista de IDs de todas as plantas"
+        })
+        if result["success"]:
+            plant_ids = result["data"]
+            _log(f"  ✓ Encontradas {len(plant_ids)} plantas")
+        _log()
+        
+        # 10. Dados em tempo real dos dispositivos
+        device_realtime_results = []
+        if device_ids:
+            _log("🔟 A obter dados em tempo real dos dispositivos...")
+            for i, (device_type, device_id) in enumerate(sampled_devices, 1):
+                _log(f"    Dispositivo {i}/{len(sampled_devices)}: {device_type} ({device_id})")
+                result = realtime_pending[i - 1].result()
+                device_realtime_results.append(result)
+                save_result(f"11_realtime_data_device_{i}", result, {
+                    "method": "get_real_time_data",
+                    "device_id": device_id,
+                    "device_type": device_type,
+                    "description": f"Dados em tempo real do dispositivo {device_type} ({device_id})"
+                })
+            _log()
+        
+        # 10b. Análise: Última vez que houve dados válidos (procura retroativamente)
+        # Nota: plant_stats_data foi definido na secção 4
+        _log("🔟b A analisar última vez que houve dados válidos (procurando retroativamente)...")
+        # Usar plant_stats_data da secção 4 (definido acima)
+        # Procurar até 30 dias atrás se necessário
+        last_valid_analysis = find_last_valid_data_timestamp(
+            client, 
+            plant_id, 
+            plant_stats_data, 
+            device_realtime_results,
+            max_days_back=30
+        )
+        save_result("11b_last_valid_data_analysis", last_valid_analysis, {
+            "method": "find_last_valid_data_timestamp",
+            "plant_id": plant_id,
+            "description": "Análise para encontrar o timestamp da última vez que houve dados válidos"
+        })
+        if last_valid_analysis.get("found"):
+            most_recent = last_valid_analysis["most_recent"]
+            _log(f"  ✓ Último dado válido encontrado:")
+            _log(f"     Fonte: {most_recent.get('source', 'N/A')}")
+            _log(f"     Timestamp: {most_recent.get('timestamp', 'N/A')}")
+            if 'value' in most_recent:
+                _log(f"     Valor: {most_recent.get('value', 'N/A')}")
+            _log(f"     Total de timestamps encontrados: {last_valid_analysis.get('total_found', 0)}")
+        else:
+            _log(f"  ⚠️  {last_valid_analysis.get('message', 'Nenhum dado válido encontrado')}")
+        _log()
+        
+        # 11. Dados de alarmes da instalação
+        _log("1️⃣1️⃣  A obter dados de alarmes da instalação...")
+        result = pending["plant_alarm_data"].result()
+        save_result("12_plant_alarm_data", result, {
+            "method": "get_plant_alarm_data",
+            "plant_id": plant_id,
+            "description": f"Dados de alarmes da instalação {plant_name}"
+        })
+        if result["success"]:
+            data = result["data"]
+            if isinstance(data, dict):
+                total_count = data.get("data", {}).get("totalCount", 0)
+                _log(f"  ✓ Encontrados {total_count} alertas na instalação")
+        _log()
+        
+        # 11b. Dados de alarmes por dispositivo (se disponível)
+        if device_ids:
+            _log("1️⃣1️⃣b A obter dados de alarmes por dispositivo...")
+            for i, (device_type, device_id) in enumerate(sampled_devices, 1):
+                _log(f"    Dispositivo {i}/{len(sampled_devices)}: {device_type} ({device_id})")
+                result = alarm_pending[i - 1].result()
+                save_result(f"12b_alarm_data_device_{i}", result, {
+                    "method": "get_alarm_data",
+                    "device_id": device_id,
+                    "device_type": device_type,
+                    "plant_id": plant_id,
+                    "description": f"Dados de alarmes do dispositivo {device_type} ({device_id}) da instalação {plant_name}"
+                })
+            _log()
+        
+        # 12. IDs de baterias
+        _log("1️⃣2️⃣  A obter IDs de baterias...")
+        result = pending["battery_ids"].result()
+        save_result("13_battery_ids", result, {
+            "method": "get_battery_ids",
+            "plant_id": plant_id,
+            "description": "Lista de IDs de baterias da instalação"
+        })
+        battery_ids = []
+        if result["success"]:
+            battery_ids = result["data"]
+            _log(f"  ✓ Encontradas {len(battery_ids)} baterias")
+        _log()
+        
+        # 13. Status das baterias
+        if battery_ids:
+            _log("1️⃣3️⃣  A obter status das baterias...")
+            # As três chamadas de todas as baterias em paralelo
+            battery_pending = [
+                (executor.submit(safe_call, client.get_battery_basic_stats, battery_id),
+                 executor.submit(safe_call, client.get_battery_status, battery_id),
+                 executor.submit(safe_call, client.get_battery_day_stats, battery_id))
+                for battery_id in battery_ids
+            ]
+            for i, battery_id in enumerate(battery_ids, 1):
+                basic_pending, status_pending, day_stats_pending = battery_pending[i - 1]
+                _log(f"    Bateria {i}/{len(battery_ids)}: {battery_id}")
+                
+                # Status básico
+                result = basic_pending.result()
+                save_result(f"14_battery_basic_{i}", result, {
+                    "method": "get_battery_basic_stats",
+                    "battery_id": battery_id,
+                    "description": f"Status básico da bateria {battery_id}"
+                })
+                
+                # Status completo
+                result = status_pending.result()
+                save_result(f"15_battery_status_{i}", result, {
+                    "method": "get_battery_status",
+                    "battery_id": battery_id,
+                    "description": f"Status completo da bateria {battery_id}"
+                })
+                
+                # Estatísticas do dia
+                result = day_stats_pending.result()
+                save_result(f"16_battery_day_stats_{i}", result, {
+                    "method": "get_battery_day_stats",
+                    "battery_id": battery_id,
+                    "description": f"Estatísticas do dia da bateria {battery_id}"
+                })
+            _log()
+        
+        # 14. Dados históricos (se device_ids disponível)
+        if device_ids:
+            _log("1️⃣4️⃣  A obter dados históricos...")
+            device_dn = device_ids[0] if device_ids else None
+            result = safe_call(client.get_historical_data, 
+                              signal_ids=['30014', '30016', '30017'], 
+                              device_dn=device_dn)
+            save_result("17_historical_data", result, {
+                "method": "get_historical_data",
+                "device_dn": device_dn,
+                "signal_ids": ['30014', '30016', '30017'],
+                "description": "Dados históricos do dispositivo"
             })
             if result["success"]:
-                print(f"      ✓ Estatísticas obtidas")
-    else:
-        # Tentar com plant_id mesmo assim (pode funcionar em alguns casos)
-        result = safe_call(client.get_optimizer_stats, plant_id)
-        save_result("18_optimizer_stats", result, {
-            "method": "get_optimizer_stats",
-            "inverter_id": plant_id,
-            "description": "Estatísticas dos otimizadores (tentativa com plant_id)"
-        })
-    print()
+                _log(f"  ✓ Dados históricos obtidos")
+            _log()
+        
+        # 15. Estatísticas de otimizadores (se disponível)
+        _log("1️⃣5️⃣  A obter estatísticas de otimizadores...")
+        # get_optimizer_stats precisa de inverter_id, não plant_id: só os inversores têm
+        # otimizadores (dispositivos de tipo desconhecido também são tentados)
+        inverter_ids = [device.dn for device in devices
+                        if device.type == "N/A" or "inv" in device.type.lower()]
+        if inverter_ids:
+            optimizer_devices = inverter_ids[:2]  # Limitar a 2
+            optimizer_pending = [executor.submit(safe_call, client.get_optimizer_stats, device_id)
+                                 for device_id in optimizer_devices]
+            for i, device_id in enumerate(optimizer_devices, 1):
+                _log(f"    Dispositivo {i}/{len(optimizer_devices)}: {device_id}")
+                result = optimizer_pending[i - 1].result()
+                save_result(f"18_optimizer_stats_device_{i}", result, {
+                    "method": "get_optimizer_stats",
+                    "inverter_id": device_id,
+                    "description": f"Estatísticas dos otimizadores do dispositivo {device_id}"
+                })
+                if result["success"]:
+                    _log(f"      ✓ Estatísticas obtidas")
+        else:
+            _log("  ⚠️  Nenhum inversor encontrado, a saltar estatísticas de otimizadores")
+        _log()
+    finally:
+        # Também em caso de erro ou Ctrl+C: cancelar os pedidos que ainda não começaram
+        executor.shutdown(cancel_futures=True)
     
     # Resumo final
     print("="*60)
     print("TESTES CONCLUÍDOS")
     print("="*60)
-    print(f"📁 Resultados guardados em: {OUTPUT_DIR.absolute()}")
-    print(f"📊 Total de ficheiros criados: {len(list(OUTPUT_DIR.glob('*.json')))}")
-    print()
-    print("💡 Dica: Analise os ficheiros JSON para ver todos os parâmetros")
-    print("   disponíveis que podem ser úteis para monitorização de estados.")
-    print()
+    if _results_jsonl is not None:
+        print(f"📁 Resultados guardados em: {Path(_results_jsonl.name).absolute()}")
+        print(f"📊 Total de resultados guardados: {_results_saved}")
+    elif _results_archive is not None:
+        print(f"📁 Resultados guardados em: {Path(_results_archive.filename).absolute()}")
+        print(f"📊 Total de ficheiros criados: {_results_saved}")
+    else:
+        print(f"📁 Resultados guardados em: {OUTPUT_DIR.absolute()}")
+        print(f"📊 Total de ficheiros criados: {_results_saved}")
+    _log()
+    _log("💡 Dica: Analise os ficheiros JSON para ver todos os parâmetros")
+    _log("   disponíveis que podem ser úteis para monitorização de estados.")
+    _log()
     
     # Logout
     try:
         client.log_out()
-        print("  ✓ Logout realizado")
+        _log("  ✓ Logout realizado")
     except:
         pass
 